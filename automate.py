@@ -5,11 +5,13 @@ import schedule
 import sys
 from datetime import datetime
 from src.graph.workflow import create_graph
+from src.graph.streaming import run_streaming
 
 # --- CONFIGURATION ---
 TARGET_ROLE = "Python Developer"
 MUST_HAVE_SKILLS = ["Python", "Django", "Remote"]
 RUN_TIME = "09:30" 
+STREAMING = "--stream" in sys.argv  # Score + alert each source as soon as it arrives
 
 def load_settings():
     """Smart Loader: Checks JSON first, then falls back to Environment Variables."""
@@ -41,8 +43,11 @@ def job_hunt_task():
         "raw_results": [], "normalized_jobs": [], "filtered_jobs": []
     }
     try:
-        app = create_graph()
-        app.invoke(initial_state)
+        if STREAMING:
+            run_streaming(initial_state)
+        else:
+            app = create_graph()
+            app.invoke(initial_state)
         print("✅ Job Hunt Finished.")
     except Exception as e:
         print(f"❌ Workflow Crashed: {e}")
@@ -52,7 +57,7 @@ if __name__ == "__main__":
         exit(1)
 
     # --- MODE 1: CLOUD / SINGLE RUN ---
-    # Run with: python automate.py --once
+    # Run with: python automate.py --once   (add --stream for streaming mode)
     if "--once" in sys.argv:
         print("⚡ Single Run Mode Activated")
         job_hunt_task()
@@ -8,8 +8,7 @@ import time
 from src.graph.workflow import create_graph
 from src.utils.history import save_to_history
 from src.llm.proposal import generate_proposals
-from src.llm.resume_tailor import tailor_resume
-from src.utils.file_manager import save_tailored_resume
+from src.llm.resume_tailor import submit_tailoring, tailoring_status, tailoring_pending, clear_finished_tailoring
 from src.models.job import Job
 from src.llm.scoring import score_jobs_with_resume
 
@@ -18,14 +17,17 @@ from src.utils.persistence import (
     save_manual_job, 
     load_manual_jobs, 
     delete_manual_job, 
+    delete_manual_jobs,
     save_cover_letter, 
+    save_cover_letters,
     load_cover_letters,
     save_application, 
     load_applications, 
     update_status
 )
 # NEW MATCHES IMPORTS
-from src.utils.google_sheets import log_jobs_to_sheet, load_new_matches, delete_new_match
+from src.utils.google_sheets import log_jobs_to_sheet, load_new_matches, delete_new_match, delete_new_matches
+from src.utils import sheets_sync
 from datetime import datetime
 
 try:
@@ -54,6 +56,27 @@ def load_profile():
 def save_profile(content):
     with open("profile.md", "w", encoding="utf-8") as f: f.write(content)
 
+PAGE_SIZES = [10, 25, 50, 100]
+
+def paginate(items, key):
+    """Renders page size / page pickers and returns only the rows on the current page."""
+    c1, c2, c3 = st.columns([1, 1, 3])
+    size = c1.selectbox("Per page", PAGE_SIZES, index=1, key=f"{key}_size")
+    pages = max(1, -(-len(items) // size))
+    current = 1
+    if st.session_state.get(f"{key}_page", 1) > pages:
+        st.session_state.pop(f"{key}_page")  # Filters shrank the list: jump to the last page
+        current = pages
+    page = c2.number_input("Page", min_value=1, max_value=pages, value=current, step=1, key=f"{key}_page")
+    start = (page - 1) * size
+    c3.caption(f"Showing {start + 1 if items else 0}-{min(start + size, len(items))} of {len(items)}")
+    return items[start:start + size]
+
+def toggle_open(key):
+    opened = st.session_state.setdefault("open_rows", set())
+    if key in opened: opened.remove(key)
+    else: opened.add(key)
+
 # --- INITIALIZE SESSION STATE ---
 if "init_done" not in st.session_state:
     saved_letters = load_cover_letters()
@@ -95,6 +118,10 @@ with st.sidebar:
             st.success("Saved!")
             st.rerun()
 
+    if st.button("🔄 Sync with Google Sheets", help="Data is stored locally and replicated to your Sheet in the background."):
+        sheets_sync.refresh_all()
+        st.toast("Pulling latest data from Google Sheets...")
+
     if api_key: os.environ["GOOGLE_API_KEY"] = api_key
     if sheet_url: os.environ["GOOGLE_SHEET_URL"] = sheet_url
     if tele_token: os.environ["TELEGRAM_BOT_TOKEN"] = tele_token
@@ -199,60 +226,112 @@ with tab_jobs:
             st.info("🎉 No pending matches. Run a search or check Tracker.")
         else:
             st.metric("Pending Matches", len(jobs))
-            for job in jobs:
+
+            with st.expander("🧹 Bulk Dismiss"):
+                cutoff = st.slider("Dismiss all matches scoring below", 0, 100, 50, key="bulk_cutoff")
+                to_dismiss = [j for j in jobs if j.relevance_score < cutoff]
+                if st.button(f"❌ Dismiss {len(to_dismiss)} matches", disabled=not to_dismiss):
+                    # One batched Sheets request per tab instead of one per job
+                    delete_manual_jobs([j.id for j in to_dismiss if j.platform == "Manual Entry"])
+                    delete_new_matches([j.id for j in to_dismiss if j.platform != "Manual Entry"])
+                    dismissed = {j.id for j in to_dismiss}
+                    st.session_state["results"]["filtered_jobs"] = [j for j in jobs if j.id not in dismissed]
+                    st.rerun()
+
+            with st.expander("✍️ Bulk Draft Letters"):
+                draft_min = st.slider("Draft letters for all matches scoring at least", 0, 100, 80, key="bulk_draft_min")
+                to_draft = [j for j in jobs if j.relevance_score >= draft_min and f"cover_letter_{j.id}" not in st.session_state]
+                if st.button(f"✍️ Draft {len(to_draft)} letters", disabled=not to_draft):
+                    with st.spinner(f"Drafting {len(to_draft)} letters..."):
+                        drafts = generate_proposals(to_draft)
+                        save_cover_letters(drafts)  # One batched Sheets push
+                        for jid, content in drafts.items():
+                            st.session_state[f"cover_letter_{jid}"] = content
+                    if len(drafts) < len(to_draft): st.warning(f"{len(to_draft) - len(drafts)} letters failed, try again.")
+                    st.toast(f"📝 Drafted {len(drafts)} letters (see Docs tab)")
+
+            with st.expander("📄 Bulk Tailor Resumes"):
+                tailor_min = st.slider("Tailor resumes for all matches scoring at least", 0, 100, 80, key="bulk_tailor_min")
+                to_tailor = [j for j in jobs if j.relevance_score >= tailor_min]
+                if st.button(f"📄 Queue {len(to_tailor)} resumes", disabled=not to_tailor):
+                    prof = load_profile()
+                    if prof:
+                        # Runs on a background pool; results show up in the Docs tab
+                        queued = submit_tailoring(to_tailor, prof)
+                        st.toast(f"⏳ Queued {queued} resumes (see Docs tab)")
+                    else: st.error("Profile is empty!")
+
+            # Filter + sort the whole list first, then only build widgets for the current page
+            f1, f2, f3 = st.columns(3)
+            min_score = f1.slider("Min score", 0, 100, 0, key="match_min_score")
+            platforms = sorted({j.platform for j in jobs})
+            chosen_platforms = f2.multiselect("Platform", platforms, key="match_platforms")
+            sort_by = f3.selectbox("Sort by", ["Score (high-low)", "Score (low-high)", "Title"], key="match_sort")
+
+            view = [j for j in jobs if j.relevance_score >= min_score and (not chosen_platforms or j.platform in chosen_platforms)]
+            if sort_by == "Title": view.sort(key=lambda j: j.title.lower())
+            else: view.sort(key=lambda j: j.relevance_score, reverse=sort_by == "Score (high-low)")
+
+            for job in paginate(view, "match"):
                 score = job.relevance_score
                 color = "green" if score >= 80 else "orange" if score >= 50 else "red"
-                
-                with st.expander(f"**:{color}[{score}/100]** {job.title} @ {getattr(job, 'company', 'Unknown')}"):
-                    c1, c2 = st.columns([3, 1])
-                    with c1:
-                        st.markdown(f"**Source:** {job.platform}")
-                        st.markdown(f"**Why:** {job.reasoning}")
-                        if hasattr(job, 'gap_analysis'): st.info(f"{job.gap_analysis}")
-                        st.markdown(f"[🔗 **Link**]({job.url})")
-
-                    with c2:
-                        if st.button("✍️ Draft Letter", key=f"cl_{job.id}"):
-                            with st.spinner("Generating..."):
-                                drafts = generate_proposals([job])
-                                content = list(drafts.values())[0]
-                                st.session_state[f"cover_letter_{job.id}"] = content
-                                save_cover_letter(job.id, content)
-                                st.rerun()
-                        
-                        if st.button("📄 Tailor Resume", key=f"res_{job.id}"):
-                            prof = load_profile()
-                            if prof:
-                                with st.spinner("Tailoring..."):
-                                    path = save_tailored_resume(tailor_resume(job, prof), job.company, job.title)
-                                    st.session_state[f"resume_{job.id}"] = path
+                is_open = f"job_{job.id}" in st.session_state.get("open_rows", set())
+
+                # Collapsed rows are one line + one button; details and actions render only when opened
+                h1, h2 = st.columns([12, 1])
+                h1.markdown(f"**:{color}[{score}/100]** {job.title} @ {getattr(job, 'company', 'Unknown')}")
+                h2.button("▾" if is_open else "▸", key=f"open_{job.id}", on_click=toggle_open, args=(f"job_{job.id}",))
+                if is_open:
+                    with st.container(border=True):
+                        c1, c2 = st.columns([3, 1])
+                        with c1:
+                            st.markdown(f"**Source:** {job.platform}")
+                            st.markdown(f"**Why:** {job.reasoning}")
+                            if hasattr(job, 'gap_analysis'): st.info(f"{job.gap_analysis}")
+                            st.markdown(f"[🔗 **Link**]({job.url})")
+
+                        with c2:
+                            if st.button("✍️ Draft Letter", key=f"cl_{job.id}"):
+                                with st.spinner("Generating..."):
+                                    # Same job + profile is served from the letter cache
+                                    content = generate_proposals([job]).get(job.id)
+                                if content:
+                                    st.session_state[f"cover_letter_{job.id}"] = content
+                                    save_cover_letter(job.id, content)
                                     st.rerun()
-                            else: st.error("Profile is empty!")
+                                else: st.error("Could not draft a letter (check GOOGLE_API_KEY).")
                         
-                        # --- TRACKING LOGIC ---
-                        if st.button("✅ Track", key=f"trk_{job.id}"):
-                            save_application(job, "Applied")
-                            st.toast("📝 Saved to Tracker!")
+                            if st.button("📄 Tailor Resume", key=f"res_{job.id}"):
+                                prof = load_profile()
+                                if prof:
+                                    submit_tailoring([job], prof)
+                                    st.toast("⏳ Tailoring in the background (see Docs tab)")
+                                else: st.error("Profile is empty!")
+                        
+                            # --- TRACKING LOGIC ---
+                            if st.button("✅ Track", key=f"trk_{job.id}"):
+                                save_application(job, "Applied")
+                                st.toast("📝 Saved to Tracker!")
                             
-                            # DELETE from source sheet
-                            if job.platform == "Manual Entry":
-                                delete_manual_job(job.id)
-                            else:
-                                delete_new_match(job.id) # <--- DELETE FROM NEW MATCHES
+                                # DELETE from source sheet
+                                if job.platform == "Manual Entry":
+                                    delete_manual_job(job.id)
+                                else:
+                                    delete_new_match(job.id) # <--- DELETE FROM NEW MATCHES
                                 
-                            # Update UI
-                            st.session_state["results"]["filtered_jobs"] = [j for j in jobs if j.id != job.id]
-                            st.rerun()
-
-                        if st.button("❌ Dismiss", key=f"d_{job.id}"):
-                            # DELETE from source sheet
-                            if job.platform == "Manual Entry":
-                                delete_manual_job(job.id)
-                            else:
-                                delete_new_match(job.id) # <--- DELETE FROM NEW MATCHES
+                                # Update UI
+                                st.session_state["results"]["filtered_jobs"] = [j for j in jobs if j.id != job.id]
+                                st.rerun()
+
+                            if st.button("❌ Dismiss", key=f"d_{job.id}"):
+                                # DELETE from source sheet
+                                if job.platform == "Manual Entry":
+                                    delete_manual_job(job.id)
+                                else:
+                                    delete_new_match(job.id) # <--- DELETE FROM NEW MATCHES
                                 
-                            st.session_state["results"]["filtered_jobs"] = [j for j in jobs if j.id != job.id]
-                            st.rerun()
+                                st.session_state["results"]["filtered_jobs"] = [j for j in jobs if j.id != job.id]
+                                st.rerun()
 
 # --- TAB 4: TRACKER ---
 with tab_tracker:
@@ -263,7 +342,12 @@ with tab_tracker:
         try: apps = sorted(apps, key=lambda x: datetime.strptime(str(x.get("Date Applied","")), "%Y-%m-%d"), reverse=True)
         except: pass
         
-        for app in apps:
+        t1, t2 = st.columns(2)
+        statuses = t1.multiselect("Status", ["Applied", "Interviewing", "Offer", "Rejected", "Ghosted"], key="tracker_status")
+        app_platforms = t2.multiselect("Platform", sorted({str(a.get("Platform", "")) for a in apps}), key="tracker_platforms")
+        apps = [a for a in apps if (not statuses or a.get("Status") in statuses) and (not app_platforms or str(a.get("Platform", "")) in app_platforms)]
+
+        for app in paginate(apps, "tracker"):
             with st.container(border=True):
                 c1, c2, c3, c4 = st.columns([3, 2, 2, 1])
                 with c1:
@@ -317,9 +401,23 @@ with tab_docs:
     col1, col2 = st.columns(2)
 
     # --- LEFT COLUMN: RESUMES (Local Files) ---
-    with col1:
+    # Re-renders on its own while background tailoring is running
+    @st.fragment(run_every=3 if tailoring_pending() else None)
+    def render_resumes():
         st.subheader("📄 Tailored Resumes")
         resume_dir = "generated_resumes"
+
+        tasks = tailoring_status()
+        if tasks:
+            pending = tailoring_pending()
+            done = sum(1 for t in tasks.values() if t["status"] == "done")
+            failed = [t for t in tasks.values() if t["status"] == "failed"]
+            st.progress(done / len(tasks), text=f"⏳ {pending} in queue · ✅ {done} done" + (f" · ❌ {len(failed)} failed" if failed else ""))
+            for t in failed:
+                st.caption(f"❌ {t['title']} @ {t['company']}: {t['error']}")
+            if not pending and st.button("🧹 Clear finished", key="clear_tailoring"):
+                clear_finished_tailoring()
+                st.rerun()
         
         # Ensure directory exists
         if not os.path.exists(resume_dir):
@@ -358,6 +456,9 @@ with tab_docs:
                     st.caption("Preview:")
                     st.code(content[:500] + "...", language="markdown")
 
+    with col1:
+        render_resumes()
+
     # --- RIGHT COLUMN: COVER LETTERS (Google Sheets) ---
     with col2:
         st.subheader("✉️ Cover Letters")
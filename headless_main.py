@@ -1,11 +1,13 @@
 import os
 import asyncio
 from src.graph.workflow import create_graph
+from src.graph.streaming import run_streaming
 
 # Load config from Environment Variables (set by GitHub Actions)
 QUERY = os.getenv("SEARCH_QUERY", "Python Developer")
 MUST_HAVES = os.getenv("MUST_HAVE_KEYWORDS", "").split(",")
 MUST_HAVES = [k.strip() for k in MUST_HAVES if k.strip()]
+STREAMING = os.getenv("STREAM_MODE", "0") == "1"  # Alert per source instead of after all fetchers
 
 def run_bot():
     print(f"🚀 Starting Headless Agent...")
@@ -27,8 +29,7 @@ def run_bot():
     }
 
     # 3. Run
-    # We use invoke() because we don't need streaming updates in the cloud logs
-    results = app.invoke(initial_state)
+    results = run_streaming(initial_state) if STREAMING else app.invoke(initial_state)
     
     # 4. Report
     draft_count = len(results.get("proposals", []))
@@ -1,5 +1,5 @@
 # src/graph/state.py
-from typing import List, Dict, Any, TypedDict, Annotated
+from typing import List, Dict, Any, Optional, TypedDict, Annotated
 import operator
 from ..models.job import Job
 
@@ -18,4 +18,5 @@ class JobState(TypedDict):
     # STEP 3: Intelligence & Output
     filtered_jobs: List[Job]   # Jobs that passed the AI check
     proposals: List[str]       # Drafted cover letters for top jobs
-    selected_platforms: List[str]
\ No newline at end of file
+    selected_platforms: List[str]
+    llm_budget: Optional[int]  # Streaming mode: AI-scoring slots left in this run
\ No newline at end of file
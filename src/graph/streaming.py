@@ -0,0 +1,113 @@
+import os
+import queue
+import threading
+from typing import Any, Dict, List
+
+from .state import JobState
+from .workflow import (
+    make_fetcher, normalize_data, prerank_jobs, score_jobs, log_results_node, notify_user, save_cursors,
+)
+from ..platforms.registry import SOURCES
+from ..utils.ranking import PRERANK_TOP_N
+
+# Streaming execution mode: the same node functions as create_graph(), but
+# wired as threads joined by bounded queues, so jobs flow
+#   fetch -> normalize/pre-rank -> filter/score -> log/notify
+# in micro-batches as soon as any fetcher returns, instead of waiting at the
+# graph's fan-in barrier for the slowest source.
+# The pre-ranker's PRERANK_TOP_N applies to the whole run, not per batch:
+# each batch's best jobs use up the shared budget, first come first served,
+# so later batches fall back to the heuristic score once it is spent.
+
+STREAM_BATCH_SIZE = int(os.getenv("STREAM_BATCH_SIZE", "25"))   # Jobs per micro-batch
+STREAM_QUEUE_SIZE = int(os.getenv("STREAM_QUEUE_SIZE", "4"))    # Batches buffered between stages
+
+_DONE = object()
+
+
+def _chunks(items: List[Any], size: int):
+    for i in range(0, len(items), max(1, size)):
+        yield items[i:i + size]
+
+
+def _stage(name: str, inbox: queue.Queue, outbox: queue.Queue, producers: int, handle, errors: List[Exception]):
+    """Consumes batches until every producer has sent _DONE, then signals downstream."""
+    finished = 0
+    try:
+        while finished < producers:
+            batch = inbox.get()
+            if batch is _DONE:
+                finished += 1
+                continue
+            try:
+                for out in handle(batch) or []:
+                    if out: outbox.put(out)
+            except Exception as e:
+                errors.append(e)
+                print(f"⚠️ Stream {name} error: {e}")
+    finally:
+        outbox.put(_DONE)
+
+
+def run_streaming(initial_state: JobState) -> Dict[str, Any]:
+    """Runs the pipeline in streaming mode. Returns the merged final state, like app.invoke()."""
+    state = dict(initial_state)
+    selected = [p for p in SOURCES if p in state.get("selected_platforms", [])]
+    raw_q: queue.Queue = queue.Queue(maxsize=STREAM_QUEUE_SIZE)
+    normalized_q: queue.Queue = queue.Queue(maxsize=STREAM_QUEUE_SIZE)
+    scored_q: queue.Queue = queue.Queue(maxsize=STREAM_QUEUE_SIZE)
+    done_q: queue.Queue = queue.Queue()
+
+    results = {"raw_results": [], "normalized_jobs": [], "filtered_jobs": []}
+    errors: List[Exception] = []
+    llm_left = [PRERANK_TOP_N if PRERANK_TOP_N > 0 else None]  # None: no cap
+    emitted_urls = set()
+
+    def fetch(platform):
+        try:
+            raw = make_fetcher(platform)(state).get("raw_results", [])
+            results["raw_results"].extend(raw)
+            for batch in _chunks(raw, STREAM_BATCH_SIZE * 2):
+                raw_q.put(batch)  # Blocks while downstream is busy (backpressure)
+        finally:
+            raw_q.put(_DONE)
+
+    def normalize(batch):
+        jobs = normalize_data({**state, "raw_results": batch}).get("normalized_jobs", [])
+        jobs = [j for j in jobs if j.url not in emitted_urls]  # Across batches
+        emitted_urls.update(j.url for j in jobs)
+        if not jobs: return []
+        jobs = prerank_jobs({**state, "normalized_jobs": jobs}).get("normalized_jobs", jobs)
+        results["normalized_jobs"].extend(jobs)
+        return _chunks(jobs, STREAM_BATCH_SIZE)
+
+    def score(batch):
+        scored = score_jobs({**state, "normalized_jobs": batch, "llm_budget": llm_left[0]}).get("filtered_jobs", [])
+        if llm_left[0] is not None:
+            llm_left[0] -= sum(1 for j in scored if j.shortlisted)
+        return [scored]
+
+    def deliver(batch):
+        results["filtered_jobs"].extend(batch)
+        log_results_node({**state, "filtered_jobs": batch})
+        if any(j.relevance_score >= 80 for j in batch):
+            notify_user({**state, "filtered_jobs": batch})
+        return []
+
+    print(f"🌊 Streaming run over {selected or 'no platforms'}...")
+    threads = [threading.Thread(target=fetch, args=(p,), name=f"stream-fetch-{p}", daemon=True) for p in selected]
+    threads += [
+        threading.Thread(target=_stage, args=("normalize", raw_q, normalized_q, len(selected), normalize, errors), daemon=True),
+        threading.Thread(target=_stage, args=("score", normalized_q, scored_q, 1, score, errors), daemon=True),
+        threading.Thread(target=_stage, args=("notify", scored_q, done_q, 1, deliver, errors), daemon=True),
+    ]
+    for t in threads: t.start()
+    done_q.get()  # The notify stage finished: every batch went through
+
+    # Like the graph's checkpoint node: only a clean run advances the cursors
+    if errors: print(f"⚠️ {len(errors)} batches failed, source cursors not advanced.")
+    else: save_cursors(state)
+
+    state.update(results)
+    print(f"✅ Streaming run finished: {len(results['filtered_jobs'])} jobs scored.")
+    return state
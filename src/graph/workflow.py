@@ -1,123 +1,78 @@
 import os
-import time  # <--- Added for throttling
-from langgraph.graph import StateGraph, END
+from langgraph.graph import StateGraph, START, END
 from .state import JobState
-from ..models.job import Job
-from ..utils.cleaning import clean_html
-from ..llm.scoring import score_jobs_with_resume
+from ..llm.scoring import apply_cached_scores, score_jobs_with_resume
 from ..utils.google_sheets import log_jobs_to_sheet
-from ..utils.history import load_history
-from ..notifications.telegram import send_telegram_alert 
-
-# --- PLATFORM IMPORTS ---
-from ..platforms.remoteok import fetch_from_remoteok
-from ..platforms.weworkremotely import fetch_weworkremotely
-from ..platforms.upwork import fetch_upwork_api
-from ..platforms.freelancer import fetch_freelancer_api
-from ..platforms.linkedin import fetch_linkedin_jobs
+from ..utils.history import get_alert_ledger, get_seen_store
+from ..utils.dedupe import collapse_near_duplicates
+from ..utils.ranking import rank_jobs, select_for_llm
+from ..notifications.telegram import dispatch_jobs
+
+# --- PLATFORM ADAPTERS (imported lazily, see platforms/registry.py) ---
+from ..platforms.registry import SOURCES, fetch_source, normalize_batch
+from ..platforms.cursors import commit_cursors
+from ..platforms.http_cache import commit_entries
 from dotenv import load_dotenv  
 
 load_dotenv()
 
 
 # --- 1. Fetchers ---
-def fetch_remoteok(state: JobState):
-    if "RemoteOK" not in state.get("selected_platforms", []): return {"raw_results": []}
-    query = state.get("search_query", "python")
-    print(f"🌍 Fetching RemoteOK for '{query}'...")
-    try:
-        raw = fetch_from_remoteok(tag=query)
-        return {"raw_results": [{"source": "remoteok", "payload": j} for j in raw]}
-    except Exception as e:
-        print(f"❌ RemoteOK Failed: {e}")
-        return {"raw_results": []}
-
-def fetch_wwr(state: JobState):
-    existing = state.get("raw_results", [])
-    if "WeWorkRemotely" not in state.get("selected_platforms", []): return {"raw_results": existing}
-    print("🌍 Fetching WeWorkRemotely...")
-    try:
-        raw = fetch_weworkremotely()
-        new = [{"source": "wwr", "payload": j} for j in raw]
-        return {"raw_results": existing + new}
-    except Exception: return {"raw_results": existing}
-
-def fetch_upwork(state: JobState):
-    existing = state.get("raw_results", [])
-    if "Upwork" not in state.get("selected_platforms", []): return {"raw_results": existing}
-    query = state.get("search_query", "python")
-    print(f"🌍 Fetching Upwork RSS for '{query}'...")
-    try:
-        raw = fetch_upwork_api(query)
-        new = [{"source": "upwork", "payload": j} for j in raw]
-        return {"raw_results": existing + new}
-    except Exception: return {"raw_results": existing}
-
-def fetch_freelancer(state: JobState):
-    existing = state.get("raw_results", [])
-    if "Freelancer" not in state.get("selected_platforms", []): return {"raw_results": existing}
-    print(f"🦅 Fetching Freelancer...")
-    try:
-        res = fetch_freelancer_api(state)
-        return {"raw_results": existing + res.get("raw_results", [])}
-    except Exception: return {"raw_results": existing}
-
-def fetch_linkedin(state: JobState):
-    existing = state.get("raw_results", [])
-    if "LinkedIn" not in state.get("selected_platforms", []): return {"raw_results": existing}
-    query = state.get("search_query", "python")
-    print(f"👔 Fetching LinkedIn (Guest Mode) for '{query}'...")
-    new_jobs = []
-    for loc in ["India", "Remote"]:
+def make_fetcher(platform: str):
+    """One graph node per platform; only selected platforms load their adapter."""
+    def fetch(state: JobState):
+        if platform not in state.get("selected_platforms", []): return {"raw_results": []}
         try:
-            raw = fetch_linkedin_jobs(query=query, location=loc)
-            new_jobs.extend([{"source": "linkedin", "payload": j} for j in raw])
-        except: pass
-    return {"raw_results": existing + new_jobs}
+            return {"raw_results": fetch_source(platform, state)}
+        except Exception as e:
+            print(f"❌ {platform} Failed: {e}")
+            return {"raw_results": []}
+    fetch.__name__ = f"fetch_{SOURCES[platform][0]}"
+    return fetch
 
 # --- 2. Normalizer ---
 def normalize_data(state: JobState):
     raw_results = state.get("raw_results", [])
     normalized_jobs = []
-    seen_history = load_history()
+    seen_history = get_seen_store()
+    alerted = get_alert_ledger()
     seen_urls = set()
     
     print(f"🔄 Normalizing {len(raw_results)} jobs...")
-    
-    for item in raw_results:
-        source = item["source"]
-        p = item["payload"]
-        try:
-            job = None
-            if source == "remoteok":
-                job = Job(id=str(p.get("id", p.get("url"))), platform="remoteok", title=p.get("position"), company=p.get("company"), description=clean_html(p.get("description")), url=p.get("url"), budget_min=float(p.get("salary_min") or 0), budget_max=float(p.get("salary_max") or 0), is_remote=True)
-            elif source == "upwork":
-                job = Job(id=p.get("id"), platform="upwork", title=p.get("title"), company="Upwork Client", description=clean_html(p.get("description")), url=p.get("link"), budget_min=float(p.get("budget_min") or 0), budget_max=float(p.get("budget_max") or 0))
-            elif source == "wwr":
-                job = Job(id=p.get("id"), platform="weworkremotely", title=p.get("title"), company=p.get("company"), description=clean_html(p.get("description")), url=p.get("link"), budget_min=0.0, budget_max=0.0)
-            elif source == "freelancer":
-                job = Job(id=str(p.get("id")), platform="freelancer", title=p.get("title"), company="Freelancer Client", description=p.get("description"), url=p.get("url"), budget_min=float(p.get("budget_min") or 0), budget_max=float(p.get("budget_max") or 0))
-            elif source == "linkedin":
-                job = Job(id=p.get("id"), platform="linkedin", title=p.get("title"), company=p.get("company"), description=p.get("description"), url=p.get("url"), budget_min=0.0, budget_max=0.0)
-
-            if job:
-                if job.id in seen_history or job.url in seen_history: continue 
-                if job.url in seen_urls: continue
-                seen_urls.add(job.url)
-                normalized_jobs.append(job)
-        except Exception: continue
+
+    # Each source's adapter builds its Job objects in one batch
+    for job in normalize_batch(raw_results):
+        if job.id in seen_history or job.url in seen_history: continue 
+        if alerted.was_alerted(job): continue  # Scored and sent in an earlier run
+        if job.url in seen_urls: continue
+        seen_urls.add(job.url)
+        normalized_jobs.append(job)
+
+    # Same role cross-posted under different URLs (RemoteOK / WWR / LinkedIn)
+    normalized_jobs = collapse_near_duplicates(normalized_jobs)
 
     print(f"✅ Normalized {len(normalized_jobs)} unique jobs.")
     return {"normalized_jobs": normalized_jobs}
 
-# --- 3. Scorer ---
-def score_jobs(state: JobState):
-    normalized = state.get("normalized_jobs", [])
+def load_resume_text():
     resume_path = "profile.md"
-    resume_text = "Generic Profile"
     if os.path.exists(resume_path):
         with open(resume_path, "r", encoding="utf-8") as f:
-            resume_text = f.read()
+            return f.read()
+    return "Generic Profile"
+
+# --- 3. Pre-Ranker (local, no network) ---
+def prerank_jobs(state: JobState):
+    normalized = state.get("normalized_jobs", [])
+    if not normalized: return {}
+    ranked = rank_jobs(normalized, load_resume_text())
+    print(f"📐 Pre-ranked {len(ranked)} jobs locally against your profile.")
+    return {"normalized_jobs": ranked}
+
+# --- 4. Scorer ---
+def score_jobs(state: JobState):
+    normalized = state.get("normalized_jobs", [])
+    resume_text = load_resume_text()
 
     from ..utils.filtering import strict_keyword_filter 
     must_haves = state.get("must_have_keywords", [])
@@ -127,10 +82,19 @@ def score_jobs(state: JobState):
     technically_qualified = strict_keyword_filter(normalized, must_haves)
     if not technically_qualified: return {"filtered_jobs": []}
 
-    scored = score_jobs_with_resume(technically_qualified, resume_text)
-    return {"filtered_jobs": scored}
+    # Only the best local matches go to the LLM; the rest keep a heuristic score
+    # (streaming mode passes `llm_budget`: LLM slots left for the whole run)
+    shortlist, rest = select_for_llm(technically_qualified, budget=state.get("llm_budget"))
+    if rest:
+        print(f"✂️ Pre-ranker kept {len(shortlist)} jobs for AI scoring, skipped {len(rest)}.")
+        # Skipped jobs that were AI-scored in an earlier run keep that score
+        reused = len(rest) - len(apply_cached_scores(rest, resume_text))
+        if reused: print(f"♻️ Reused cached AI scores for {reused} skipped jobs.")
+
+    scored = score_jobs_with_resume(shortlist, resume_text)
+    return {"filtered_jobs": scored + rest}
 
-# --- 4. LOGGER (RUNS FIRST) ---
+# --- 5. LOGGER (RUNS FIRST) ---
 def log_results_node(state: JobState):
     top_jobs = state.get("filtered_jobs", [])
     sheet_url = os.getenv("GOOGLE_SHEET_URL")
@@ -141,10 +105,10 @@ def log_results_node(state: JobState):
     worthy_jobs = [j for j in top_jobs if j.relevance_score >= 80]
     
     if worthy_jobs:
+        # Write-behind: rows are spooled locally and pushed by the background replicator
         print(f"📝 Logging {len(worthy_jobs)} high-quality jobs (80+) to Google Sheets...")
         try:
-            log_jobs_to_sheet(worthy_jobs, sheet_url)
-            print("✅ Successfully logged to Google Sheets.")
+            log_jobs_to_sheet(worthy_jobs)
         except Exception as e:
             print(f"❌ Sheet Logging Error: {e}")
     else:
@@ -152,7 +116,7 @@ def log_results_node(state: JobState):
             
     return {}
 
-# --- 5. NOTIFIER (RUNS SECOND - CAPPED) ---
+# --- 6. NOTIFIER (RUNS SECOND - CAPPED) ---
 def notify_user(state: JobState):
     all_jobs = state.get("filtered_jobs", [])
     
@@ -162,54 +126,67 @@ def notify_user(state: JobState):
     # SORT: Best matches first
     high_value.sort(key=lambda x: x.relevance_score, reverse=True)
     
-    # CAP: Top 5 Only
-    top_picks = high_value[:5]
-    
     token = os.getenv("TELEGRAM_BOT_TOKEN")
     chat_id = os.getenv("TELEGRAM_CHAT_ID")
     
-    if token and chat_id and top_picks:
-        print(f"🚀 Sending Telegram alerts for Top {len(top_picks)} jobs...")
-        for i, job in enumerate(top_picks):
-            try:
-                send_telegram_alert(job.title, job.url, job.relevance_score, job.reasoning, "[View in Dashboard]")
-                # THROTTLE: Sleep 1s to prevent timeout/ban
-                if i < len(top_picks) - 1: 
-                    time.sleep(1) 
-            except Exception as e:
-                print(f"⚠️ Telegram Error for {job.title}: {e}")
+    # Many matches go out as one digest; undelivered messages stay in the outbox
+    if token and chat_id:
+        ledger = get_alert_ledger()
+        fresh = ledger.claim(high_value)  # Skips jobs alerted by any earlier run
+        if fresh:
+            print(f"🚀 Sending Telegram alerts for {len(fresh)} jobs...")
+        elif high_value:
+            print(f"🔕 All {len(high_value)} matches were already alerted.")
+        try:
+            dispatch_jobs(fresh, "[View in Dashboard]")
+        except Exception as e:
+            ledger.release(fresh)
+            print(f"⚠️ Telegram Error: {e}")
     
     return {}
 
-# --- 6. Graph Construction ---
+# --- 7. CHECKPOINT (RUNS LAST) ---
+def save_cursors(state: JobState):
+    # Only now have this run's postings been scored, logged and alerted:
+    # advance the per-source high-water marks and the feeds' ETags
+    # (a crash before this re-fetches them)
+    try: commit_cursors()
+    except Exception as e: print(f"⚠️ Could not save source cursors: {e}")
+    try: commit_entries()
+    except Exception as e: print(f"⚠️ HTTP cache write failed: {e}")
+    return {}
+
+# --- 8. Graph Construction ---
+FETCHER_NODES = [f"{source}_fetcher" for source, _ in SOURCES.values()]
+
 def create_graph():
     workflow = StateGraph(JobState)
 
-    workflow.add_node("remoteok_fetcher", fetch_remoteok)
-    workflow.add_node("wwr_fetcher", fetch_wwr)
-    workflow.add_node("upwork_fetcher", fetch_upwork)
-    workflow.add_node("freelancer_fetcher", fetch_freelancer) 
-    workflow.add_node("linkedin_fetcher", fetch_linkedin)
+    for platform, (source, _) in SOURCES.items():
+        workflow.add_node(f"{source}_fetcher", make_fetcher(platform))
     
     workflow.add_node("normalizer", normalize_data)
+    workflow.add_node("preranker", prerank_jobs)
     workflow.add_node("scorer", score_jobs)
     workflow.add_node("logger", log_results_node) # ✅ Logger is now a node
     workflow.add_node("notifier", notify_user)
-
-    # Flow
-    workflow.set_entry_point("remoteok_fetcher") 
-    workflow.add_edge("remoteok_fetcher", "wwr_fetcher")
-    workflow.add_edge("wwr_fetcher", "upwork_fetcher")   
-    workflow.add_edge("upwork_fetcher", "freelancer_fetcher")
-    workflow.add_edge("freelancer_fetcher", "linkedin_fetcher")
-    workflow.add_edge("linkedin_fetcher", "normalizer") 
+    workflow.add_node("checkpoint", save_cursors)
+
+    # Flow: fetchers run as parallel branches and join at the normalizer.
+    # Each one only returns its own results; `raw_results` is merged by the
+    # operator.add reducer declared on JobState.
+    for fetcher in FETCHER_NODES:
+        workflow.add_edge(START, fetcher)
+    workflow.add_edge(FETCHER_NODES, "normalizer")
     
-    workflow.add_edge("normalizer", "scorer")
+    workflow.add_edge("normalizer", "preranker")
+    workflow.add_edge("preranker", "scorer")
     
-    # ✅ NEW ORDER: Scorer -> Logger -> Notifier -> END
+    # ✅ NEW ORDER: Scorer -> Logger -> Notifier -> Checkpoint -> END
     # This ensures data is saved even if Telegram crashes
     workflow.add_edge("scorer", "logger")
     workflow.add_edge("logger", "notifier")
-    workflow.add_edge("notifier", END)      
+    workflow.add_edge("notifier", "checkpoint")
+    workflow.add_edge("checkpoint", END)      
 
     return workflow.compile()
\ No newline at end of file
@@ -1,7 +1,11 @@
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict
 from pathlib import Path
 from ..models.job import Job
+from ..utils.kv_cache import KVCache, content_hash
+from ..utils.rate_limit import RateLimiter
 
 try:
     from google import genai
@@ -16,60 +20,151 @@ Expertise: Python, Django, FastAPI, AWS, and Web Scraping.
 GitHub: github.com/pgauin01
 """
 
+# Bump whenever the prompt or model changes so cached letters are regenerated
+PROMPT_VERSION = "v1"
+PROPOSAL_MODEL = "gemini-2.5-flash"
+
+PROPOSAL_CACHE_TTL_DAYS = float(os.getenv("PROPOSAL_CACHE_TTL_DAYS", "60"))
+PROPOSAL_CACHE_MAX_ENTRIES = int(os.getenv("PROPOSAL_CACHE_MAX_ENTRIES", "5000"))
+
+# Letters are drafted in parallel, throttled to the model's quota
+PROPOSAL_CONCURRENCY = int(os.getenv("PROPOSAL_CONCURRENCY", "4"))
+PROPOSAL_RPM = float(os.getenv("PROPOSAL_RPM", "10"))
+
+PROMPT_TEMPLATE = """
+        You are an expert freelancer applying for a job. Write a concise, professional cover letter.
+        
+        MY PROFILE:
+        {profile}
+        
+        JOB DESCRIPTION:
+        Title: {title}
+        Company: {company}
+        Description: {description}
+        
+        RULES:
+        1. Keep it under 150 words.
+        2. Mention specific skills from the description that match my profile.
+        3. Do not use placeholders. Sign it with the name found in the profile (or "A Dedicated Developer" if none found).
+        """
+
+_lock = threading.Lock()
+_client = None
+_client_key = None
+_rate_limiter = None
+_proposal_cache = None
+_profile = (None, None)  # (mtime, text)
+
 def load_profile():
-    """Reads the user's profile from profile.md in the root directory."""
+    """Reads the user's profile from profile.md in the root directory (re-read only when it changes)."""
+    global _profile
     try:
         # Assuming profile.md is in the project root (2 levels up from this file)
         root_dir = Path(__file__).parent.parent.parent
         profile_path = root_dir / "profile.md"
         
         if profile_path.exists():
-            return profile_path.read_text(encoding="utf-8")
+            mtime = profile_path.stat().st_mtime
+            if _profile[0] != mtime:
+                _profile = (mtime, profile_path.read_text(encoding="utf-8"))
+            return _profile[1]
         else:
             return "A passionate Python Developer with 5 years of experience."
     except Exception:
         return "A passionate Python Developer."
 
-def generate_proposals(jobs: List[Job]) -> Dict[str, str]:
+def get_client(api_key: str):
+    """One genai client per API key, shared by every caller."""
+    global _client, _client_key
+    with _lock:
+        if _client is None or _client_key != api_key:
+            _client = genai.Client(api_key=api_key)
+            _client_key = api_key
+        return _client
+
+def get_rate_limiter() -> RateLimiter:
+    global _rate_limiter
+    with _lock:
+        if _rate_limiter is None:
+            _rate_limiter = RateLimiter(PROPOSAL_RPM)
+        return _rate_limiter
+
+def get_proposal_cache() -> KVCache:
+    global _proposal_cache
+    with _lock:
+        if _proposal_cache is None:
+            _proposal_cache = KVCache("proposals", PROPOSAL_CACHE_TTL_DAYS * 86400, PROPOSAL_CACHE_MAX_ENTRIES)
+        return _proposal_cache
+
+def build_prompt(job: Job, user_profile: str) -> str:
+    return PROMPT_TEMPLATE.format(
+        profile=user_profile,
+        title=job.title,
+        company=getattr(job, 'company', 'Unknown'),
+        description=(job.description or "")[:800],
+    )
+
+def proposal_cache_key(job: Job, profile_hash: str) -> str:
+    """Content-addressed: same job text + same profile/prompt/model -> same letter."""
+    return f"{content_hash(job.title, getattr(job, 'company', ''), (job.description or '')[:800])}:{profile_hash}"
+
+def generate_proposals(jobs: List[Job], refresh: bool = False) -> Dict[str, str]:
     """
     Generates a cover letter for the top jobs.
     Returns a dict: {job_id: proposal_text}
+    Letters already drafted for the same job text and profile come from the
+    cache (unless `refresh`); the rest are drafted concurrently.
     """
-    api_key = os.getenv("GOOGLE_API_KEY")
     user_profile = load_profile()
+    profile_hash = content_hash(user_profile, PROMPT_VERSION, PROPOSAL_MODEL)
+    keys = {job.id: proposal_cache_key(job, profile_hash) for job in jobs}
+
+    try:
+        cached = {} if refresh else get_proposal_cache().get_many(keys.values())
+    except Exception as e:
+        print(f"⚠️ Proposal cache unavailable: {e}")
+        cached = {}
+    proposals = {job.id: cached[keys[job.id]] for job in jobs if keys[job.id] in cached}
+    to_draft = [job for job in jobs if job.id not in proposals]
+    if proposals:
+        print(f"♻️ Reused {len(proposals)} cached cover letters.")
+    if not to_draft:
+        return proposals
+
+    api_key = os.getenv("GOOGLE_API_KEY")
     if not api_key or not genai:
-        return {}
+        return proposals
 
-    client = genai.Client(api_key=api_key)
-    proposals = {}
+    client = get_client(api_key)
+    limiter = get_rate_limiter()
 
-    print(f"✍️  Drafting proposals for {len(jobs)} jobs...")
+    def draft(job):
+        limiter.acquire()
+        response = client.models.generate_content(
+            model=PROPOSAL_MODEL,
+            contents=build_prompt(job, user_profile)
+        )
+        return response.text
 
-    for job in jobs:
-        prompt = f"""
-        You are an expert freelancer applying for a job. Write a concise, professional cover letter.
-        
-        MY PROFILE:
-        {user_profile}
-        
-        JOB DESCRIPTION:
-        Title: {job.title}
-        Company: {getattr(job, 'company', 'Unknown')}
-        Description: {job.description[:800]}
-        
-        RULES:
-        1. Keep it under 150 words.
-        2. Mention specific skills from the description that match my profile.
-        3. Do not use placeholders. Sign it with the name found in the profile (or "A Dedicated Developer" if none found).
-        """
+    print(f"✍️  Drafting proposals for {len(to_draft)} jobs ({PROPOSAL_CONCURRENCY} parallel)...")
+
+    with ThreadPoolExecutor(max_workers=max(1, PROPOSAL_CONCURRENCY)) as pool:
+        futures = [pool.submit(draft, job) for job in to_draft]
 
+    fresh = {}
+    for job, future in zip(to_draft, futures):
         try:
-            response = client.models.generate_content(
-                model="gemini-2.5-flash",
-                contents=prompt
-            )
-            proposals[job.id] = response.text
+            text = future.result()
         except Exception as e:
             print(f"❌ Failed to draft for {job.title}: {e}")
+            continue
+        if text:
+            proposals[job.id] = text
+            fresh[keys[job.id]] = text
+
+    try:
+        get_proposal_cache().put_many(fresh)
+    except Exception as e:
+        print(f"⚠️ Could not cache cover letters: {e}")
             
-    return proposals
\ No newline at end of file
+    return proposals
@@ -1,28 +1,36 @@
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
 from langchain_core.prompts import PromptTemplate
 from langchain_google_genai import ChatGoogleGenerativeAI
 from ..models.job import Job
+from ..utils.file_manager import save_tailored_resume
+from ..utils.kv_cache import KVCache, content_hash
+from ..utils.rate_limit import RateLimiter
 
-def tailor_resume(job: Job, base_resume: str) -> str:
-    """
-    Rewrites the base resume to highlight skills relevant to the specific job.
-    """
-    api_key = os.getenv("GOOGLE_API_KEY")
-    llm = ChatGoogleGenerativeAI(
-        model="gemini-2.5-pro", # Use Pro for better writing
-        google_api_key=api_key,
-        temperature=0.3
-    )
+# Bump whenever the prompt or model changes so cached resumes are rewritten
+PROMPT_VERSION = "v1"
+TAILOR_MODEL = "gemini-2.5-pro"  # Use Pro for better writing
+MAX_JD_CHARS = 5000              # Truncate to fit context
+
+TAILOR_CACHE_TTL_DAYS = float(os.getenv("TAILOR_CACHE_TTL_DAYS", "60"))
+TAILOR_CACHE_MAX_ENTRIES = int(os.getenv("TAILOR_CACHE_MAX_ENTRIES", "2000"))
+
+# Background queue: a few resumes in flight, throttled to the Pro model's quota
+TAILOR_WORKERS = int(os.getenv("TAILOR_WORKERS", "2"))
+TAILOR_RPM = float(os.getenv("TAILOR_RPM", "5"))
 
-    prompt = PromptTemplate.from_template("""
+PROMPT = PromptTemplate.from_template("""
     You are an expert Resume Writer & ATS Optimizer.
-    
+
     JOB DESCRIPTION:
     {job_description}
-    
+
     CANDIDATE PROFILE (Markdown):
     {profile}
-    
+
     TASK:
     Rewrite the Candidate Profile to target this specific job.
     1. SUMMARY: Rewrite the professional summary to mention the specific role title and matching keywords.
@@ -30,18 +38,148 @@ def tailor_resume(job: Job, base_resume: str) -> str:
     3. BULLET POINTS: Tweak the experience bullet points to use the same terminology as the JD (e.g., if JD says "Restful Services", change "API" to "Restful Services").
     4. Do NOT invent lies. Only rephrase existing experience.
     5. Keep the Markdown format.
-    
+
     OUTPUT:
     The full tailored markdown resume.
     """)
 
+_lock = threading.Lock()
+_llm = None
+_llm_key = None
+_rate_limiter = None
+_tailor_cache = None
+_pool = None
+_tasks: Dict[str, Dict[str, Any]] = {}  # job id -> {"title", "company", "status", "path", "error", "queued_at"}
+
+
+def get_llm(api_key: str) -> ChatGoogleGenerativeAI:
+    """One chat client per API key, shared by every caller and worker."""
+    global _llm, _llm_key
+    with _lock:
+        if _llm is None or _llm_key != api_key:
+            _llm = ChatGoogleGenerativeAI(model=TAILOR_MODEL, google_api_key=api_key, temperature=0.3)
+            _llm_key = api_key
+        return _llm
+
+
+def get_rate_limiter() -> RateLimiter:
+    global _rate_limiter
+    with _lock:
+        if _rate_limiter is None:
+            _rate_limiter = RateLimiter(TAILOR_RPM)
+        return _rate_limiter
+
+
+def get_tailor_cache() -> KVCache:
+    global _tailor_cache
+    with _lock:
+        if _tailor_cache is None:
+            _tailor_cache = KVCache("tailored_resumes", TAILOR_CACHE_TTL_DAYS * 86400, TAILOR_CACHE_MAX_ENTRIES)
+        return _tailor_cache
+
+
+def tailor_cache_key(job: Job, base_resume: str) -> str:
+    """Content-addressed: same job text + same profile/prompt/model -> same resume."""
+    return content_hash(
+        job.title, getattr(job, "company", ""), (job.description or "")[:MAX_JD_CHARS],
+        content_hash(base_resume), PROMPT_VERSION, TAILOR_MODEL,
+    )
+
+
+def _tailor(job: Job, base_resume: str) -> str:
+    """Cached LLM rewrite. Raises on failure (nothing is cached then)."""
+    key = tailor_cache_key(job, base_resume)
     try:
-        chain = prompt | llm
-        response = chain.invoke({
-            "job_description": job.description[:5000], # Truncate to fit context
-            "profile": base_resume
-        })
-        return response.content
+        cached = get_tailor_cache().get(key)
+    except Exception as e:
+        print(f"⚠️ Resume cache unavailable: {e}")
+        cached = None
+    if cached:
+        print(f"♻️ Reused cached resume for {job.title}.")
+        return cached
+
+    chain = PROMPT | get_llm(os.getenv("GOOGLE_API_KEY"))
+    get_rate_limiter().acquire()
+    response = chain.invoke({
+        "job_description": (job.description or "")[:MAX_JD_CHARS],
+        "profile": base_resume
+    })
+    content = response.content
+    if content:
+        try: get_tailor_cache().put(key, content)
+        except Exception as e: print(f"⚠️ Could not cache resume: {e}")
+    return content
+
+
+def tailor_resume(job: Job, base_resume: str) -> str:
+    """
+    Rewrites the base resume to highlight skills relevant to the specific job.
+    """
+    try:
+        return _tailor(job, base_resume) or base_resume
     except Exception as e:
         print(f"❌ Resume Tailoring Failed: {e}")
-        return base_resume # Fallback to original
\ No newline at end of file
+        return base_resume # Fallback to original
+
+
+# --- Background batch mode ---
+def _get_pool() -> ThreadPoolExecutor:
+    global _pool
+    with _lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=max(1, TAILOR_WORKERS), thread_name_prefix="hustlebot-tailor")
+        return _pool
+
+
+def _set_task(job_id: str, **fields):
+    with _lock:
+        _tasks[job_id].update(fields)
+
+
+def _run_task(job: Job, base_resume: str):
+    _set_task(job.id, status="running")
+    try:
+        content = _tailor(job, base_resume)
+        if not content: raise ValueError("empty answer")
+        path = save_tailored_resume(content, job.company, job.title)
+        _set_task(job.id, status="done", path=path)
+    except Exception as e:
+        print(f"❌ Resume Tailoring Failed for {job.title}: {e}")
+        _set_task(job.id, status="failed", error=str(e))
+
+
+def submit_tailoring(jobs: List[Job], base_resume: str) -> int:
+    """
+    Queues resumes for the given jobs on the background pool and returns
+    immediately. Jobs already queued or running are skipped; returns the number queued.
+    """
+    queued = []
+    with _lock:
+        for job in jobs:
+            if _tasks.get(job.id, {}).get("status") in ("queued", "running"): continue
+            _tasks[job.id] = {
+                "title": job.title, "company": getattr(job, "company", ""),
+                "status": "queued", "path": None, "error": None, "queued_at": time.time(),
+            }
+            queued.append(job)
+    pool = _get_pool()
+    for job in queued:
+        pool.submit(_run_task, job, base_resume)
+    return len(queued)
+
+
+def tailoring_status() -> Dict[str, Dict[str, Any]]:
+    """Snapshot of every job submitted in this process: {job_id: task info}."""
+    with _lock:
+        return {job_id: dict(task) for job_id, task in _tasks.items()}
+
+
+def tailoring_pending() -> int:
+    with _lock:
+        return sum(1 for task in _tasks.values() if task["status"] in ("queued", "running"))
+
+
+def clear_finished_tailoring():
+    with _lock:
+        for job_id in [j for j, task in _tasks.items() if task["status"] in ("done", "failed")]:
+            del _tasks[job_id]
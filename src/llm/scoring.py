@@ -1,8 +1,11 @@
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.prompts import PromptTemplate
 from ..models.job import Job
+from ..utils.kv_cache import KVCache, content_hash
+from ..utils.rate_limit import RateLimiter, estimate_tokens
 
 # Try to import Gemini, fallback if not installed (though requirements.txt has it)
 try:
@@ -10,20 +13,128 @@ try:
 except ImportError:
     pass
 
+# Bump whenever the prompt or model changes so cached scores are recomputed
+PROMPT_VERSION = "v1"
+SCORING_MODEL = "gemini-2.0-flash"
+
+SCORE_CACHE_TTL_DAYS = float(os.getenv("SCORE_CACHE_TTL_DAYS", "14"))
+SCORE_CACHE_MAX_ENTRIES = int(os.getenv("SCORE_CACHE_MAX_ENTRIES", "20000"))
+
+# Parallel batches, throttled to the Gemini quota (requests / tokens per minute)
+SCORING_CONCURRENCY = int(os.getenv("SCORING_CONCURRENCY", "4"))
+GEMINI_RPM = float(os.getenv("GEMINI_RPM", "15"))
+GEMINI_TPM = float(os.getenv("GEMINI_TPM", "1000000"))
+
+# Adaptive batch packing: fill each request up to a token budget instead of a
+# fixed job count. MAX_BATCH_JOBS bounds the size of the JSON answer.
+SCORING_BATCH_TOKEN_BUDGET = int(os.getenv("SCORING_BATCH_TOKEN_BUDGET", "6000"))
+SCORING_MAX_BATCH_JOBS = int(os.getenv("SCORING_MAX_BATCH_JOBS", "15"))
+SCORING_MAX_DESC_CHARS = int(os.getenv("SCORING_MAX_DESC_CHARS", "6000"))
+
+_score_cache = None
+_rate_limiter = None
+
+def get_rate_limiter() -> RateLimiter:
+    """Process-wide limiter so concurrent callers share one quota."""
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = RateLimiter(GEMINI_RPM, GEMINI_TPM)
+    return _rate_limiter
+
+def get_score_cache() -> KVCache:
+    global _score_cache
+    if _score_cache is None:
+        _score_cache = KVCache("scores", SCORE_CACHE_TTL_DAYS * 86400, SCORE_CACHE_MAX_ENTRIES)
+    return _score_cache
+
+def score_cache_key(job: Job, profile_hash: str) -> str:
+    """Cache key: hash of the job text + hash of the resume/prompt version."""
+    return f"{content_hash(job.id, job.title, job.description)}:{profile_hash}"
+
+def parse_score(value):
+    """Model score -> int 0-100 ("85", 85.0, "85%" all work); None if unusable."""
+    try:
+        return max(0, min(100, int(round(float(str(value).strip().rstrip("%"))))))
+    except (TypeError, ValueError):
+        return None
+
+def apply_score(job: Job, res: dict) -> bool:
+    """Copies one LLM result onto the job. False (job untouched) if the score is unusable."""
+    score = parse_score(res.get("score", 0))
+    if score is None:
+        return False
+    job.relevance_score = score
+    job.reasoning = res.get("reasoning", "No reasoning.")
+    # We store the gap analysis in the 'reasoning' or a new attribute if we had one.
+    # Let's pack it into 'reasoning' for now to keep the model simple, or add a dynamic attribute.
+    job.gap_analysis = f"⚠️ Gaps: {res.get('gaps', 'None')}\n💡 Strategy: {res.get('advice', 'None')}"
+    return True
+
+def job_payload(job: Job) -> dict:
+    """What the LLM sees for one job (description capped for very long posts)."""
+    return {"id": job.id, "title": job.title, "description": (job.description or "")[:SCORING_MAX_DESC_CHARS]}
+
+def pack_batches(items, token_budget=None, max_jobs=None):
+    """
+    Greedily packs (job, key) items, in order, into batches whose estimated
+    job tokens stay under `token_budget`. A job larger than the budget gets a
+    batch of its own.
+    """
+    token_budget = token_budget or SCORING_BATCH_TOKEN_BUDGET
+    max_jobs = max_jobs or SCORING_MAX_BATCH_JOBS
+    batches, current, used = [], [], 0
+    for item in items:
+        cost = estimate_tokens(json.dumps(job_payload(item[0])))
+        if current and (used + cost > token_budget or len(current) >= max_jobs):
+            batches.append(current)
+            current, used = [], 0
+        current.append(item)
+        used += cost
+    if current:
+        batches.append(current)
+    return batches
+
+def apply_cached_scores(jobs, resume_text):
+    """
+    Applies cached LLM scores (same job text, same profile) in place.
+    Returns [(job, cache key)] for the jobs that have no cached score.
+    """
+    profile_hash = content_hash(resume_text[:3000], PROMPT_VERSION, SCORING_MODEL)
+    keys = [score_cache_key(job, profile_hash) for job in jobs]
+    try:
+        cached = get_score_cache().get_many(keys)
+    except Exception as e:
+        print(f"⚠️ Score cache unavailable: {e}")
+        cached = {}
+
+    missing = []
+    for job, key in zip(jobs, keys):
+        res = cached.get(key)
+        if not (res and apply_score(job, res)): missing.append((job, key))
+    return missing
+
 def score_jobs_with_resume(jobs, resume_text):
     """
     Compares a list of Job objects against a Resume (Markdown).
     Returns the list with updated .relevance_score, .reasoning, and .gap_analysis.
+    Jobs already scored against the same profile are served from the score cache.
     """
+    # 1. Cache lookup: reposts already scored against this profile cost nothing
+    to_score = apply_cached_scores(jobs, resume_text)
+    if len(to_score) < len(jobs):
+        print(f"♻️ Reused cached scores for {len(jobs) - len(to_score)} jobs.")
+    if not to_score:
+        return jobs
+
     api_key = os.getenv("GOOGLE_API_KEY")
     if not api_key:
         print("⚠️ No API Key found. Skipping AI scoring.")
         return jobs
 
-    # 1. Setup the Brain (Gemini Flash is fast & cheap)
-    llm = ChatGoogleGenerativeAI(model="gemini-2.0-flash", temperature=0.1)
+    # 2. Setup the Brain (Gemini Flash is fast & cheap)
+    llm = ChatGoogleGenerativeAI(model=SCORING_MODEL, temperature=0.1)
 
-    # 2. The "Career Coach" Prompt
+    # 3. The "Career Coach" Prompt
     prompt_template = """
     You are an expert Technical Recruiter. 
     I will give you a Candidate Profile and a list of Jobs.
@@ -46,45 +157,74 @@ def score_jobs_with_resume(jobs, resume_text):
     
     prompt = PromptTemplate(template=prompt_template, input_variables=["resume", "jobs_data"])
 
-    # 3. Batch Process (to save time/money)
-    # We send jobs in batches of 5
-    batch_size = 5
-    scored_jobs = []
-
-    print(f"🧠 AI Analyzing {len(jobs)} jobs against your resume...")
+    # 4. Batch Process (to save time/money)
+    # Jobs are packed into token-budgeted batches, several in flight at once
+    chain = prompt | llm
+    limiter = get_rate_limiter()
+    resume_snippet = resume_text[:3000]
 
-    for i in range(0, len(jobs), batch_size):
-        batch = jobs[i : i + batch_size]
-        
+    def call_llm(batch):
         # Prepare data for LLM
-        jobs_input = json.dumps([
-            {"id": j.id, "title": j.title, "description": j.description[:2000]} # Truncate desc to save tokens
-            for j in batch
-        ])
+        jobs_input = json.dumps([job_payload(j) for j, _ in batch])
+        limiter.acquire(estimate_tokens(prompt_template) + estimate_tokens(resume_snippet) + estimate_tokens(jobs_input))
+        response = chain.invoke({"resume": resume_snippet, "jobs_data": jobs_input})
 
+        # Clean response (remove markdown code blocks if any)
+        content = response.content.replace("```json", "").replace("```", "").strip()
+        parsed_results = json.loads(content)
+        return {str(item["id"]): item for item in parsed_results}
+
+    def run_batch(batch):
+        # Unparseable or truncated output (jobs missing from the answer):
+        # retry the unanswered jobs in two smaller batches.
         try:
-            chain = prompt | llm
-            response = chain.invoke({"resume": resume_text[:3000], "jobs_data": jobs_input})
-            
-            # Clean response (remove markdown code blocks if any)
-            content = response.content.replace("```json", "").replace("```", "").strip()
-            parsed_results = json.loads(content)
-
-            # Map results back to Job objects
-            results_map = {str(item["id"]): item for item in parsed_results}
-
-            for job in batch:
-                res = results_map.get(str(job.id))
-                if res:
-                    job.relevance_score = int(res.get("score", 0))
-                    job.reasoning = res.get("reasoning", "No reasoning.")
-                    # We store the gap analysis in the 'reasoning' or a new attribute if we had one.
-                    # Let's pack it into 'reasoning' for now to keep the model simple, or add a dynamic attribute.
-                    job.gap_analysis = f"⚠️ Gaps: {res.get('gaps', 'None')}\n💡 Strategy: {res.get('advice', 'None')}"
-                scored_jobs.append(job)
+            results_map = call_llm(batch)
+        except (ValueError, KeyError, TypeError) as e:
+            if len(batch) == 1: raise
+            print(f"   ⚠️ Unparseable answer for {len(batch)} jobs ({e}), shrinking batch...")
+            results_map = {}
+
+        missing = [item for item in batch if str(item[0].id) not in results_map]
+        if missing and len(batch) > 1:
+            mid = max(1, len(missing) // 2)
+            for half in (missing[:mid], missing[mid:]):
+                if not half: continue
+                try: results_map.update(run_batch(half))
+                except Exception as e: print(f"   ❌ Retry batch failed: {e}")
+        return results_map
+
+    batches = pack_batches(to_score)
+    print(f"🧠 AI Analyzing {len(to_score)} jobs against your resume ({len(batches)} batches, {SCORING_CONCURRENCY} parallel)...")
+
+    with ThreadPoolExecutor(max_workers=max(1, SCORING_CONCURRENCY)) as pool:
+        futures = [pool.submit(run_batch, batch) for batch in batches]
 
+    # Merge back in submission order so results are deterministic
+    fresh = {}
+    for batch, future in zip(batches, futures):
+        try:
+            results_map = future.result()
         except Exception as e:
-            print(f"   ❌ Batch failed: {e}")
-            scored_jobs.extend(batch) # Keep original if failed
+            print(f"   ❌ Batch failed: {e}") # Keep original if failed
+            continue
+
+        # Map results back to Job objects
+        # One malformed item only loses that job's score, never the run
+        for job, key in batch:
+            res = results_map.get(str(job.id))
+            try:
+                if not (isinstance(res, dict) and apply_score(job, res)):
+                    if res: print(f"   ⚠️ Unusable score for {job.title}: {res.get('score') if isinstance(res, dict) else res!r}")
+                    continue
+            except Exception as e:
+                print(f"   ⚠️ Could not apply score for {job.title}: {e}")
+                continue
+            fresh[key] = {k: res.get(k) for k in ("score", "reasoning", "gaps", "advice")}
+            fresh[key]["score"] = job.relevance_score
+
+    try:
+        get_score_cache().put_many(fresh)
+    except Exception as e:
+        print(f"⚠️ Score cache write failed: {e}")
 
-    return scored_jobs
\ No newline at end of file
+    return jobs
@@ -23,4 +23,6 @@ class Job:
     # Analysis fields (filled by AI later)
     relevance_score: int = 0
     reasoning: str = ""
+    prerank_score: float = 0.0  # Local lexical similarity to profile.md (0-1)
+    shortlisted: bool = False   # Picked by the pre-ranker for AI scoring
     company: str = "Unknown"
\ No newline at end of file
@@ -1,41 +1,231 @@
-import requests
+import asyncio
+import html
 import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from ..platforms import http
+from ..utils.rate_limit import TokenBucket
+
+# Telegram delivery. Messages are written to a persistent outbox first and
+# then sent concurrently on the shared fetch loop (pooled connection), paced
+# by token buckets matching Telegram's limits: ~1 message/second per chat and
+# 30/second per bot. Anything not delivered stays in the outbox and is retried
+# on the next dispatch. Above DIGEST_THRESHOLD matches, one digest message is
+# sent instead of one alert per job.
+
+OUTBOX_DB = os.getenv("HUSTLEBOT_DB", "hustlebot.db")
+API_URL = "https://api.telegram.org/bot{token}/sendMessage"
+MAX_MESSAGE_CHARS = 4000  # Telegram rejects texts over 4096 characters
+
+DIGEST_THRESHOLD = int(os.getenv("TELEGRAM_DIGEST_THRESHOLD", "3"))  # More matches than this -> one digest
+DIGEST_MAX_JOBS = int(os.getenv("TELEGRAM_DIGEST_MAX_JOBS", "25"))   # Rest is summarised as "+N more"
+MAX_ATTEMPTS = int(os.getenv("TELEGRAM_MAX_ATTEMPTS", "10"))         # Then the message is dropped
+SEND_TIMEOUT = 10
+
+_bot_bucket = TokenBucket(30, 1.0)
+_chat_buckets: Dict[str, TokenBucket] = {}
+
+
+def _credentials():
+    return os.getenv("TELEGRAM_BOT_TOKEN"), os.getenv("TELEGRAM_CHAT_ID")
 
-def send_telegram_alert(job_title: str, job_url: str, score: int, reasoning: str, proposal: str = None):
-    """
-    Sends a formatted alert to your Telegram.
-    """
-    bot_token = os.getenv("TELEGRAM_BOT_TOKEN")
-    chat_id = os.getenv("TELEGRAM_CHAT_ID")
-    
-    if not bot_token or not chat_id:
-        print("⚠️ Telegram credentials missing. Skipping alert.")
-        return
 
-    # Format the message (HTML style)
+# --- Formatting ---
+def format_alert(job_title: str, job_url: str, score: int, reasoning: str, proposal: str = None) -> str:
     emoji = "🔥" if score >= 90 else "✨"
-    
     message = (
         f"{emoji} <b>NEW MATCH FOUND!</b> ({score}/100)\n\n"
-        f"<b>Role:</b> {job_title}\n"
-        f"<b>Reason:</b> {reasoning}\n"
-        f"<b>Link:</b> <a href='{job_url}'>Apply Now</a>\n"
+        f"<b>Role:</b> {html.escape(job_title or '')}\n"
+        f"<b>Reason:</b> {html.escape(reasoning or '')}\n"
+        f"<b>Link:</b> <a href='{html.escape(job_url or '', quote=True)}'>Apply Now</a>\n"
     )
-    
     if proposal:
         # Truncate proposal for preview
         preview = proposal[:200] + "..."
-        message += f"\n<b>📝 Draft Preview:</b>\n<i>{preview}</i>"
-
-    url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
-    payload = {
-        "chat_id": chat_id,
-        "text": message,
-        "parse_mode": "HTML",
-        "disable_web_page_preview": True
-    }
-    
+        message += f"\n<b>📝 Draft Preview:</b>\n<i>{html.escape(preview)}</i>"
+    return message
+
+
+def format_digest(jobs: List[Any], note: str = "[View in Dashboard]") -> List[str]:
+    """One digest (split into several messages only if it exceeds Telegram's size limit)."""
+    header = f"📬 <b>{len(jobs)} NEW MATCHES</b>\n\n"
+    lines = []
+    for job in jobs[:DIGEST_MAX_JOBS]:
+        emoji = "🔥" if job.relevance_score >= 90 else "✨"
+        # Cut before escaping, so an entity like &amp; is never split
+        title = html.escape((job.title or "")[:120])
+        company = html.escape((getattr(job, "company", "") or "")[:60])
+        lines.append(
+            f"{emoji} <b>{job.relevance_score}</b> · <a href='{html.escape(job.url or '', quote=True)}'>{title}</a>"
+            + (f" — {company}" if company else "")
+        )
+    if len(jobs) > DIGEST_MAX_JOBS:
+        lines.append(f"\n…and {len(jobs) - DIGEST_MAX_JOBS} more {html.escape(note)}")
+
+    messages, current = [], header
+    for line in lines:
+        if len(current) + len(line) + 1 > MAX_MESSAGE_CHARS:
+            messages.append(current)
+            current = ""
+        current += line + "\n"
+    messages.append(current)
+    return messages
+
+
+# --- Outbox ---
+class TelegramOutbox:
+    """Undelivered messages, kept in the local store DB until Telegram accepts them."""
+
+    def __init__(self, db_path: str = OUTBOX_DB):
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS telegram_outbox ("
+            " seq INTEGER PRIMARY KEY AUTOINCREMENT, chat_id TEXT NOT NULL, text TEXT NOT NULL,"
+            " created_at REAL NOT NULL, attempts INTEGER DEFAULT 0)"
+        )
+        self.conn.commit()
+
+    def enqueue(self, chat_id: str, texts: List[str]):
+        with self.lock:
+            self.conn.executemany(
+                "INSERT INTO telegram_outbox (chat_id, text, created_at) VALUES (?, ?, ?)",
+                [(str(chat_id), text, time.time()) for text in texts],
+            )
+            self.conn.commit()
+
+    def pending(self, limit: int = 100) -> List[Dict[str, Any]]:
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT seq, chat_id, text, attempts FROM telegram_outbox ORDER BY seq LIMIT ?", (limit,)
+            ).fetchall()
+        return [{"seq": r[0], "chat_id": r[1], "text": r[2], "attempts": r[3]} for r in rows]
+
+    def ack(self, seqs: List[int]):
+        with self.lock:
+            self.conn.executemany("DELETE FROM telegram_outbox WHERE seq = ?", [(s,) for s in seqs])
+            self.conn.commit()
+
+    def mark_failed(self, seqs: List[int]):
+        with self.lock:
+            self.conn.executemany("UPDATE telegram_outbox SET attempts = attempts + 1 WHERE seq = ?", [(s,) for s in seqs])
+            self.conn.execute("DELETE FROM telegram_outbox WHERE attempts >= ?", (MAX_ATTEMPTS,))
+            self.conn.commit()
+
+
+_outbox: Optional[TelegramOutbox] = None
+_outbox_lock = threading.Lock()
+
+
+def get_outbox() -> TelegramOutbox:
+    global _outbox
+    with _outbox_lock:
+        if _outbox is None:
+            _outbox = TelegramOutbox()
+        return _outbox
+
+
+# --- Delivery ---
+def _chat_bucket(chat_id: str) -> TokenBucket:
+    if chat_id not in _chat_buckets:
+        _chat_buckets[chat_id] = TokenBucket(1, 1.0)
+    return _chat_buckets[chat_id]
+
+
+async def _send_async(token: str, chat_id: str, text: str) -> bool:
+    """Sends one message, honouring Telegram's retry_after once on 429."""
+    payload = {"chat_id": chat_id, "text": text, "parse_mode": "HTML", "disable_web_page_preview": True}
+    for _ in range(2):
+        await _chat_bucket(chat_id).acquire_async()
+        await _bot_bucket.acquire_async()
+        try:
+            response = await http.post(API_URL.format(token=token), json=payload, timeout=SEND_TIMEOUT)
+        except Exception as e:
+            print(f"❌ Failed to send Telegram alert: {e}")
+            return False
+        if response.status_code == 200:
+            return True
+        if response.status_code == 429:
+            try: retry_after = float(response.json().get("parameters", {}).get("retry_after", 1))
+            except Exception: retry_after = 1.0
+            await asyncio.sleep(min(retry_after, 30))
+            continue
+        print(f"⚠️ Telegram returned status {response.status_code}: {response.text[:200]}")
+        return False
+    return False
+
+
+async def _flush_async(token: str, items: List[Dict[str, Any]]) -> List[bool]:
+    # Per-chat buckets keep each chat in order; different chats go out concurrently
+    by_chat: Dict[str, List[Dict[str, Any]]] = {}
+    for item in items:
+        by_chat.setdefault(item["chat_id"], []).append(item)
+
+    async def send_chat(chat_items):
+        return [await _send_async(token, item["chat_id"], item["text"]) for item in chat_items]
+
+    results = await asyncio.gather(*(send_chat(chat_items) for chat_items in by_chat.values()))
+    sent = {}
+    for chat_items, oks in zip(by_chat.values(), results):
+        for item, ok in zip(chat_items, oks):
+            sent[item["seq"]] = ok
+    return [sent[item["seq"]] for item in items]
+
+
+def flush_outbox() -> int:
+    """Sends everything in the outbox. Returns the number of messages delivered."""
+    token, _ = _credentials()
+    if not token:
+        return 0
+    outbox = get_outbox()
+    items = outbox.pending()
+    if not items:
+        return 0
     try:
-        requests.post(url, json=payload, timeout=5)
+        results = http.run_async(_flush_async(token, items))
     except Exception as e:
-        print(f"❌ Failed to send Telegram alert: {e}")
\ No newline at end of file
+        print(f"❌ Telegram delivery failed: {e}")
+        results = [False] * len(items)
+
+    delivered = [item["seq"] for item, ok in zip(items, results) if ok]
+    failed = [item["seq"] for item, ok in zip(items, results) if not ok]
+    outbox.ack(delivered)
+    if failed:
+        outbox.mark_failed(failed)
+        print(f"⚠️ {len(failed)} Telegram messages kept in the outbox for the next run.")
+    return len(delivered)
+
+
+def dispatch_jobs(jobs: List[Any], note: str = "[View in Dashboard]") -> int:
+    """
+    Queues alerts for the given jobs (one per job, or a digest above
+    DIGEST_THRESHOLD) and flushes the outbox, including leftovers from
+    earlier runs. Returns the number of messages delivered.
+    """
+    token, chat_id = _credentials()
+    if not token or not chat_id:
+        print("⚠️ Telegram credentials missing. Skipping alert.")
+        return 0
+    if jobs:
+        if len(jobs) > DIGEST_THRESHOLD:
+            texts = format_digest(jobs, note)
+        else:
+            texts = [format_alert(j.title, j.url, j.relevance_score, j.reasoning, note) for j in jobs]
+        get_outbox().enqueue(chat_id, texts)
+    return flush_outbox()
+
+
+def send_telegram_alert(job_title: str, job_url: str, score: int, reasoning: str, proposal: str = None):
+    """
+    Sends a formatted alert to your Telegram.
+    """
+    token, chat_id = _credentials()
+    if not token or not chat_id:
+        print("⚠️ Telegram credentials missing. Skipping alert.")
+        return
+    get_outbox().enqueue(chat_id, [format_alert(job_title, job_url, score, reasoning, proposal)])
+    flush_outbox()
@@ -0,0 +1,147 @@
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+# Per-source high-water marks ("newest posting time seen") in source_cursors.json.
+# Fetchers page forward from the newest results and stop at the first page
+# that reaches the cursor, so a quiet poll is one request and postings that
+# slid off page one since the last run are still picked up.
+# New cursors are only staged while fetching; they are committed by the
+# graph's last node (after logging and alerts), so a crashed run re-fetches.
+
+CURSORS_FILE = os.getenv("SOURCE_CURSORS_FILE", "source_cursors.json")
+MAX_PAGES = int(os.getenv("SOURCE_MAX_PAGES", "5"))  # Safety cap per source/query per run
+
+_lock = threading.Lock()
+_staged: Dict[str, float] = {}
+
+
+def _key(source: str, query: str) -> str:
+    return f"{source}:{(query or '').strip().lower()}"
+
+
+def _load() -> Dict[str, float]:
+    if not os.path.exists(CURSORS_FILE):
+        return {}
+    try:
+        with open(CURSORS_FILE, "r") as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+def get_cursor(source: str, query: str = "") -> Optional[float]:
+    """Epoch seconds of the newest posting seen for this source/query (None on first run)."""
+    with _lock:
+        return _load().get(_key(source, query))
+
+
+def stage_cursor(source: str, query: str, newest: Optional[float]):
+    if newest is None: return
+    with _lock:
+        key = _key(source, query)
+        _staged[key] = max(newest, _staged.get(key, newest))
+
+
+def commit_cursors():
+    """Persists the cursors staged by this run's fetchers."""
+    with _lock:
+        if not _staged: return
+        cursors = _load()
+        for key, newest in _staged.items():
+            cursors[key] = max(newest, cursors.get(key, newest))
+        _staged.clear()
+        tmp = CURSORS_FILE + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(cursors, f, indent=2, sort_keys=True)
+        os.replace(tmp, CURSORS_FILE)
+
+
+def to_epoch(value: Any) -> Optional[float]:
+    """Parses the timestamp formats the boards use (epoch, ISO-8601, RFC-822, plain date)."""
+    if value in (None, ""):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value) / 1000 if value > 1e12 else float(value)  # ms epochs
+    text = str(value).strip()
+    try:
+        dt = datetime.fromisoformat(text.replace("Z", "+00:00"))
+    except ValueError:
+        try: dt = parsedate_to_datetime(text)
+        except (TypeError, ValueError): return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def filter_new(source: str, query: str, items: List[Dict[str, Any]], timestamp: Callable[[Dict[str, Any]], Any]) -> List[Dict[str, Any]]:
+    """For feeds returned in one response (RemoteOK API, WWR RSS): keeps postings since the cursor."""
+    cursor = get_cursor(source, query)
+    stamps = [to_epoch(timestamp(item)) for item in items]
+    known = [ts for ts in stamps if ts is not None]
+    if known: stage_cursor(source, query, max(known))
+    if cursor is None: return items
+    fresh = [item for item, ts in zip(items, stamps) if ts is None or ts >= cursor]
+    print(f"   ↳ {source}: {len(fresh)} postings since last run")
+    return fresh
+
+
+async def fetch_new_pages(
+    source: str,
+    query: str,
+    fetch_page: Callable[[int], Awaitable[Optional[List[Dict[str, Any]]]]],
+    timestamp: Callable[[Dict[str, Any]], Any],
+    max_pages: int = None,
+    first_run_pages: int = 1,
+    newest_first: bool = True,
+) -> List[Dict[str, Any]]:
+    """
+    Calls fetch_page(0), fetch_page(1), ... and returns items posted at or
+    after the cursor. For sources that sort newest first, paging stops at the
+    first page that contains already-seen items; pass newest_first=False for
+    sources without a guaranteed order (then up to max_pages are read).
+    A page that turns out not to be in newest-first order never stops paging.
+    Without a cursor (first run) `first_run_pages` pages are fetched.
+    Items without a timestamp are always kept.
+
+    fetch_page returns [] past the last page and None (or raises) when the
+    request failed. After a failed page the cursor is not advanced at all:
+    the missing postings lie between the old cursor and the last page read,
+    so the next run pages through that range again (repeats are deduped).
+    """
+    max_pages = MAX_PAGES if max_pages is None else max_pages
+    cursor = get_cursor(source, query)
+    newest = cursor
+    items = []
+    ordered = newest_first
+    failed = False
+
+    for page_no in range(max_pages if cursor is not None else min(first_run_pages, max_pages)):
+        try:
+            page = await fetch_page(page_no)
+        except Exception as e:
+            print(f"   ⚠️ {source}: page {page_no + 1} failed: {e}")
+            page = None
+        if page is None:
+            failed = True
+            break
+        if not page: break
+        stamps = [to_epoch(timestamp(item)) for item in page]
+        fresh = [item for item, ts in zip(page, stamps) if cursor is None or ts is None or ts >= cursor]
+        items.extend(fresh)
+        known = [ts for ts in stamps if ts is not None]
+        if known: newest = max(known + ([newest] if newest is not None else []))
+        ordered = ordered and all(a >= b for a, b in zip(known, known[1:]))
+        if ordered and len(fresh) < len(page):
+            break  # Reached postings from a previous run
+
+    if failed:
+        print(f"   ⚠️ {source}: incomplete fetch, cursor kept for the next run")
+    else:
+        stage_cursor(source, query, newest)
+    if cursor is not None:
+        print(f"   ↳ {source}: {len(items)} postings since last run")
+    return items
@@ -1,41 +1,81 @@
-import requests
+from typing import Any, Dict, List
+
 from ..graph.state import JobState
+from ..models.job import Job
+from . import http
+from .cursors import fetch_new_pages
+
+PAGE_SIZE = 20
 
 def fetch_freelancer_api(state: JobState):
+    """Sync wrapper around `fetch_freelancer_api_async`."""
+    return http.run_async(fetch_freelancer_api_async(state))
+
+async def fetch_freelancer_api_async(state: JobState):
     query = state.get("search_query", "python")
     print(f"🦅 Fetching Freelancer.com for '{query}'...")
     
+    try:
+        # Sorted by time_updated; the early stop only kicks in while pages
+        # actually come back newest first (checked per page in fetch_new_pages)
+        results = await fetch_new_pages(
+            "freelancer", query,
+            lambda page: _fetch_page(query, offset=page * PAGE_SIZE),
+            lambda item: item["payload"].get("time_updated"),
+        )
+        return {"raw_results": results}
+    except Exception as e:
+        print(f"❌ Freelancer API Failed: {e}")
+        return {"raw_results": []}
+
+async def _fetch_page(query: str, offset: int = 0):
     url = "https://www.freelancer.com/api/projects/0.1/projects/active"
     params = {
         "query": query,
-        "limit": 20,
+        "limit": PAGE_SIZE,
+        "offset": offset,
         "sort_field": "time_updated",
         "job_details": "true" # Get description
     }
     
-    try:
-        resp = requests.get(url, params=params)
-        data = resp.json()
-        
-        projects = data.get("result", {}).get("projects", [])
-        
-        results = []
-        for p in projects:
-            results.append({
-                "source": "freelancer",
-                "payload": {
-                    "id": p.get("id"),
-                    "title": p.get("title"),
-                    "description": p.get("preview_description"),
-                    "url": f"https://www.freelancer.com/projects/{p.get('seo_url')}",
-                    "budget_min": p.get("budget", {}).get("minimum"),
-                    "budget_max": p.get("budget", {}).get("maximum"),
-                    "currency": p.get("currency", {}).get("code")
-                }
-            })
-            
-        return {"raw_results": results}
-        
-    except Exception as e:
-        print(f"❌ Freelancer API Failed: {e}")
-        return {"raw_results": []}
\ No newline at end of file
+    resp = await http.get(url, params=params)
+    if resp.status_code != 200:
+        print(f"   ⚠️ Freelancer returned status {resp.status_code}")
+        return None  # Not "no more results": fetch_new_pages holds the cursor back
+    data = resp.json()
+    
+    projects = data.get("result", {}).get("projects", [])
+    
+    results = []
+    for p in projects:
+        results.append({
+            "source": "freelancer",
+            "payload": {
+                "id": p.get("id"),
+                "title": p.get("title"),
+                "description": p.get("preview_description"),
+                "url": f"https://www.freelancer.com/projects/{p.get('seo_url')}",
+                "budget_min": p.get("budget", {}).get("minimum"),
+                "budget_max": p.get("budget", {}).get("maximum"),
+                "currency": p.get("currency", {}).get("code"),
+                "time_updated": p.get("time_updated") or p.get("time_submitted")
+            }
+        })
+    return results
+
+
+# --- Source adapter (see registry.py) ---
+SOURCE = "freelancer"
+
+def fetch(state: JobState) -> List[Dict[str, Any]]:
+    print("🦅 Fetching Freelancer...")
+    res = fetch_freelancer_api(state)
+    return [item["payload"] for item in res.get("raw_results", [])]
+
+def normalize(payloads: List[Dict[str, Any]]) -> List[Job]:
+    jobs = []
+    for p in payloads:
+        try:
+            jobs.append(Job(id=str(p.get("id")), platform="freelancer", title=p.get("title"), company="Freelancer Client", description=p.get("description"), url=p.get("url"), budget_min=float(p.get("budget_min") or 0), budget_max=float(p.get("budget_max") or 0)))
+        except Exception: continue
+    return jobs
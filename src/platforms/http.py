@@ -0,0 +1,117 @@
+import asyncio
+import atexit
+import os
+import threading
+from typing import Any, Awaitable, Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from ..utils.rate_limit import TokenBucket
+
+# Shared async fetch engine for every platform module.
+# One keep-alive client lives on a single background event loop, so TLS
+# handshakes and connection setup are paid once per host, and sync callers
+# (the LangGraph fetcher nodes) can still just call `run_async(...)`.
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+}
+
+MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "20"))
+PER_HOST_LIMIT = int(os.getenv("HTTP_PER_HOST_LIMIT", "4"))
+DEFAULT_TIMEOUT = 15.0
+
+_lock = threading.Lock()
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_client: Optional[httpx.AsyncClient] = None
+_host_limits: Dict[str, asyncio.Semaphore] = {}
+_host_rates: Dict[str, TokenBucket] = {}  # Optional requests-per-minute cap per host
+
+
+def _ensure_loop() -> asyncio.AbstractEventLoop:
+    """Starts the background event loop the shared client lives on."""
+    global _loop
+    with _lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=_loop.run_forever, name="hustlebot-http", daemon=True)
+            thread.start()
+        return _loop
+
+
+def run_async(coro: Awaitable[Any]) -> Any:
+    """
+    Runs a coroutine on the shared fetch loop and blocks until it finishes.
+    Safe to call from any thread except the fetch loop itself.
+    """
+    loop = _ensure_loop()
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+
+def run_async_all(coros: Iterable[Awaitable[Any]]) -> List[Any]:
+    """Runs several coroutines concurrently. Failures are returned as exceptions, not raised."""
+    async def _gather():
+        return await asyncio.gather(*coros, return_exceptions=True)
+    return run_async(_gather())
+
+
+def get_client() -> httpx.AsyncClient:
+    """Returns the process-wide pooled client. Must be called on the fetch loop."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            headers=DEFAULT_HEADERS,
+            timeout=DEFAULT_TIMEOUT,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_CONNECTIONS),
+        )
+    return _client
+
+
+def _host_semaphore(url: str) -> asyncio.Semaphore:
+    host = urlsplit(url).netloc
+    if host not in _host_limits:
+        _host_limits[host] = asyncio.Semaphore(PER_HOST_LIMIT)
+    return _host_limits[host]
+
+
+def set_host_rate(host: str, per_minute: float):
+    """Caps requests to `host` at `per_minute` (burst of the same size)."""
+    with _lock:
+        _host_rates[host] = TokenBucket(per_minute, 60.0)
+
+
+async def request(method: str, url: str, **kwargs) -> httpx.Response:
+    """
+    Sends a request through the shared client, capped at PER_HOST_LIMIT in
+    flight per host and at the host's rate limit, if one was set.
+    """
+    bucket = _host_rates.get(urlsplit(url).netloc)
+    if bucket is not None:
+        await bucket.acquire_async()
+    async with _host_semaphore(url):
+        return await get_client().request(method, url, **kwargs)
+
+
+async def get(url: str, **kwargs) -> httpx.Response:
+    return await request("GET", url, **kwargs)
+
+
+async def post(url: str, **kwargs) -> httpx.Response:
+    return await request("POST", url, **kwargs)
+
+
+def close():
+    """Closes the shared client (registered at exit)."""
+    global _client
+    if _loop is None or _loop.is_closed() or _client is None:
+        return
+    try:
+        asyncio.run_coroutine_threadsafe(_client.aclose(), _loop).result(timeout=5)
+    except Exception:
+        pass
+    _client = None
+
+
+atexit.register(close)
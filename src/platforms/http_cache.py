@@ -0,0 +1,119 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, NamedTuple, Optional
+
+from . import http
+
+# On-disk conditional-GET cache for polled endpoints (RemoteOK API, WWR RSS).
+# One small JSON file per URL holds the validators (ETag / Last-Modified)
+# and the last body, so a cron run that finds nothing new gets a 304 and
+# never re-downloads or re-parses the feed.
+# Like the source cursors, new entries are only staged while fetching and
+# written by the graph's checkpoint node: a run that crashes before its
+# postings are logged must not get a 304 for them on the next poll.
+
+CACHE_DIR = os.getenv("HTTP_CACHE_DIR", ".http_cache")
+
+_lock = threading.Lock()
+_staged: Dict[str, Dict[str, Any]] = {}  # cache key -> entry, written by commit_entries()
+
+
+class CachedResponse(NamedTuple):
+    text: Optional[str]   # Body (None on 304 unless reuse_body=True)
+    changed: bool         # False when the server answered 304 Not Modified
+
+
+def _cache_key(url: str, params: Optional[Dict[str, Any]]) -> str:
+    raw = url + "?" + json.dumps(params or {}, sort_keys=True)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _entry_path(key: str) -> str:
+    return os.path.join(CACHE_DIR, f"{key}.json")
+
+
+def load_entry(url: str, params: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    """Returns the stored validators/body for a URL, or None."""
+    path = _entry_path(_cache_key(url, params))
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+
+def store_entry(url: str, params: Optional[Dict[str, Any]], entry: Dict[str, Any]):
+    """Atomically writes a cache entry (tmp file + rename)."""
+    _write(_cache_key(url, params), entry)
+
+
+def _write(key: str, entry: Dict[str, Any]):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    path = _entry_path(key)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(entry, f)
+    os.replace(tmp_path, path)
+
+
+def stage_entry(url: str, params: Optional[Dict[str, Any]], entry: Dict[str, Any]):
+    with _lock:
+        _staged[_cache_key(url, params)] = entry
+
+
+def commit_entries():
+    """Persists the entries staged by this run's fetchers."""
+    with _lock:
+        staged = dict(_staged)
+        _staged.clear()
+    for key, entry in staged.items():
+        _write(key, entry)
+
+
+async def get_conditional(
+    url: str,
+    params: Optional[Dict[str, Any]] = None,
+    headers: Optional[Dict[str, str]] = None,
+    timeout: float = http.DEFAULT_TIMEOUT,
+    reuse_body: bool = False,
+) -> CachedResponse:
+    """
+    GETs a URL with If-None-Match / If-Modified-Since from the last response.
+    On 304 returns changed=False (and the cached body only if reuse_body).
+    Raises for HTTP errors, like `response.raise_for_status()`.
+    """
+    entry = await asyncio.to_thread(load_entry, url, params)
+    request_headers = dict(headers or {})
+    if entry:
+        if entry.get("etag"):
+            request_headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            request_headers["If-Modified-Since"] = entry["last_modified"]
+
+    response = await http.get(url, params=params, headers=request_headers, timeout=timeout)
+
+    if response.status_code == 304 and entry:
+        return CachedResponse(entry.get("body") if reuse_body else None, False)
+
+    response.raise_for_status()
+    text = response.text
+
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if etag or last_modified:
+        new_entry = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched_at": time.time(),
+            "body": text,
+        }
+        stage_entry(url, params, new_entry)
+
+    return CachedResponse(text, True)
@@ -1,16 +1,53 @@
-import requests
+import asyncio
+import os
+import re
 from bs4 import BeautifulSoup
-import time
-import random
+from typing import Any, Dict, List, Optional
+
+from ..graph.state import JobState
+from ..models.job import Job
+from ..utils.cleaning import clean_html
+from ..utils.kv_cache import KVCache
+from . import http
+from .cursors import fetch_new_pages
+
+SEARCH_URL = "https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search"
+DETAIL_URL = "https://www.linkedin.com/jobs-guest/jobs/api/jobPosting/{job_id}"
+PAGE_SIZE = 25  # Guest API page size
+PLACEHOLDER_DESCRIPTION = "LinkedIn Job - Click link to view full details."
+
+LOCATIONS = [loc.strip() for loc in os.getenv("LINKEDIN_LOCATIONS", "India,Remote").split(",") if loc.strip()]
+LINKEDIN_MAX_PAGES = int(os.getenv("LINKEDIN_MAX_PAGES", "4"))          # Per location per run
+LINKEDIN_RPM = float(os.getenv("LINKEDIN_RPM", "40"))                    # Guest API is quick to 429
+LINKEDIN_FETCH_DETAILS = os.getenv("LINKEDIN_FETCH_DETAILS", "1") == "1"  # Fill in real descriptions
+LINKEDIN_MAX_DETAILS = int(os.getenv("LINKEDIN_MAX_DETAILS", "60"))      # Uncached detail pages per run
+DETAIL_CACHE_TTL_DAYS = 30
+
+http.set_host_rate("www.linkedin.com", LINKEDIN_RPM)
+
+_detail_cache: Optional[KVCache] = None
 
 def fetch_linkedin_jobs(query="Python", location="Remote"):
+    """Sync wrapper around `fetch_linkedin_jobs_async`."""
+    return http.run_async(fetch_linkedin_jobs_async(query=query, location=location))
+
+async def fetch_linkedin_jobs_async(query="Python", location="Remote"):
     """
-    Fetches jobs from LinkedIn's Guest API.
+    Fetches jobs from LinkedIn's Guest API posted since the last run
+    (newest first, paging until already-seen postings are reached).
     :param query: Job role (e.g. "Python")
     :param location: "India", "Remote", "United States", etc.
     """
-    base_url = "https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search"
-    
+    return await fetch_new_pages(
+        "linkedin", f"{query}|{location}",
+        lambda page: fetch_linkedin_page_async(query, location, start=page * PAGE_SIZE),
+        lambda job: job.get("date"),
+        max_pages=LINKEDIN_MAX_PAGES,
+        first_run_pages=LINKEDIN_MAX_PAGES,
+    )
+
+async def fetch_linkedin_page_async(query="Python", location="Remote", start=0):
+    """Fetches one page (25 cards) of LinkedIn's Guest API, newest first. None if the request failed."""
     headers = {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
     }
@@ -18,21 +55,22 @@ def fetch_linkedin_jobs(query="Python", location="Remote"):
     params = {
         "keywords": query,
         "location": location,
-        "start": 0
+        "start": start,
+        "sortBy": "DD"  # Date posted, newest first
     }
 
-    print(f"   ...Contacting LinkedIn Guest API for '{query}' in '{location}'...")
+    print(f"   ...Contacting LinkedIn Guest API for '{query}' in '{location}' (start={start})...")
     
     jobs = []
     try:
-        # We fetch the first 25 jobs per location
-        response = requests.get(base_url, params=params, headers=headers, timeout=10)
+        response = await http.get(SEARCH_URL, params=params, headers=headers, timeout=10)
         
         if response.status_code != 200:
             print(f"   ⚠️ LinkedIn returned status {response.status_code}")
-            return []
+            return None
 
-        soup = BeautifulSoup(response.text, "html.parser")
+        # Parsing is CPU-bound; keep it off the shared fetch loop
+        soup = await asyncio.to_thread(BeautifulSoup, response.text, "html.parser")
         job_cards = soup.find_all("li")
 
         for card in job_cards:
@@ -42,6 +80,7 @@ def fetch_linkedin_jobs(query="Python", location="Remote"):
                 loc_tag = card.find("span", class_="job-search-card__location")
                 anchor_tag = card.find("a", class_="base-card__full-link")
                 date_tag = card.find("time")
+                urn_tag = card.find(attrs={"data-entity-urn": True})
 
                 if title_tag and anchor_tag:
                     # Clean up URL (remove tracking params)
@@ -54,7 +93,8 @@ def fetch_linkedin_jobs(query="Python", location="Remote"):
                         "location": loc_tag.text.strip() if loc_tag else location,
                         "url": clean_url,
                         "date": date_tag.get("datetime") if date_tag else None,
-                        "description": "LinkedIn Job - Click link to view full details." 
+                        "description": PLACEHOLDER_DESCRIPTION,
+                        "posting_id": _posting_id(urn_tag.get("data-entity-urn") if urn_tag else "", clean_url)
                     }
                     jobs.append(job)
             except Exception:
@@ -62,5 +102,87 @@ def fetch_linkedin_jobs(query="Python", location="Remote"):
                 
     except Exception as e:
         print(f"   ❌ LinkedIn Fetch Error: {e}")
+        return None
+
+    return jobs
+
+
+def _posting_id(urn: str, url: str) -> str:
+    """Numeric posting id from the card's URN (urn:li:jobPosting:123) or the URL slug (...-123)."""
+    m = re.search(r"(\d{6,})$", urn or "") or re.search(r"-(\d{6,})/?$", url or "")
+    return m.group(1) if m else ""
+
+
+def get_detail_cache() -> KVCache:
+    global _detail_cache
+    if _detail_cache is None:
+        _detail_cache = KVCache("linkedin_details", DETAIL_CACHE_TTL_DAYS * 86400, 20000)
+    return _detail_cache
+
 
-    return jobs
\ No newline at end of file
+async def fetch_description_async(posting_id: str) -> str:
+    """Description text from a posting's guest detail page ("" on failure)."""
+    try:
+        response = await http.get(DETAIL_URL.format(job_id=posting_id), timeout=10)
+        if response.status_code != 200:
+            return ""
+        soup = await asyncio.to_thread(BeautifulSoup, response.text, "html.parser")
+        markup = soup.find("div", class_="show-more-less-html__markup") or soup.find("div", class_="description__text")
+        return clean_html(str(markup)) if markup else ""
+    except Exception:
+        return ""
+
+
+async def fill_descriptions_async(jobs: List[Dict[str, Any]]):
+    """Replaces placeholder descriptions with the detail-page text (cached, fetched concurrently)."""
+    ids = [j["posting_id"] for j in jobs if j.get("posting_id")]
+    cache = get_detail_cache()
+    cached = await asyncio.to_thread(cache.get_many, ids)
+
+    missing = [pid for pid in dict.fromkeys(ids) if pid not in cached][:LINKEDIN_MAX_DETAILS]
+    if missing:
+        print(f"   ...Fetching {len(missing)} LinkedIn job descriptions ({len(cached)} cached)...")
+        texts = await asyncio.gather(*(fetch_description_async(pid) for pid in missing))
+        fresh = {pid: text for pid, text in zip(missing, texts) if text}
+        if fresh:
+            await asyncio.to_thread(cache.put_many, fresh)
+        cached.update(fresh)
+
+    for job in jobs:
+        text = cached.get(job.get("posting_id"))
+        if text:
+            job["description"] = text
+
+
+async def crawl_linkedin_async(query: str, locations: List[str] = None) -> List[Dict[str, Any]]:
+    """All locations are paged concurrently (rate limited per host), then detail pages are filled in."""
+    results = await asyncio.gather(
+        *(fetch_linkedin_jobs_async(query=query, location=loc) for loc in (locations or LOCATIONS)),
+        return_exceptions=True,
+    )
+    jobs = {}
+    for raw in results:
+        if isinstance(raw, Exception): continue
+        for job in raw:
+            jobs.setdefault(job["id"], job)  # Same posting can show up under several locations
+    jobs = list(jobs.values())
+    if LINKEDIN_FETCH_DETAILS and jobs:
+        await fill_descriptions_async(jobs)
+    return jobs
+
+
+# --- Source adapter (see registry.py) ---
+SOURCE = "linkedin"
+
+def fetch(state: JobState) -> List[Dict[str, Any]]:
+    query = state.get("search_query", "python")
+    print(f"👔 Fetching LinkedIn (Guest Mode) for '{query}' in {LOCATIONS}...")
+    return http.run_async(crawl_linkedin_async(query))
+
+def normalize(payloads: List[Dict[str, Any]]) -> List[Job]:
+    jobs = []
+    for p in payloads:
+        try:
+            jobs.append(Job(id=p.get("id"), platform="linkedin", title=p.get("title"), company=p.get("company"), description=p.get("description"), url=p.get("url"), budget_min=0.0, budget_max=0.0))
+        except Exception: continue
+    return jobs
@@ -0,0 +1,58 @@
+import importlib
+import threading
+from typing import Any, Dict, List
+
+from ..models.job import Job
+
+# Source-adapter registry. Every platform module is an adapter exposing:
+#   SOURCE                     -> key used in raw_results items
+#   fetch(state)               -> list of raw payloads
+#   normalize(payloads)        -> list of Job objects (one batch per source)
+# Modules are imported on first use, so boards that aren't selected cost
+# nothing (e.g. bs4 is only loaded when LinkedIn is searched).
+
+# Platform label (as in `selected_platforms`) -> (source key, module name)
+SOURCES = {
+    "RemoteOK": ("remoteok", "remoteok"),
+    "WeWorkRemotely": ("wwr", "weworkremotely"),
+    "Upwork": ("upwork", "upwork"),
+    "Freelancer": ("freelancer", "freelancer"),
+    "LinkedIn": ("linkedin", "linkedin"),
+}
+_MODULES = {source: module for source, module in SOURCES.values()}
+
+_adapters: Dict[str, Any] = {}
+_lock = threading.Lock()
+
+
+def get_adapter(source: str):
+    """Imports (once) and returns the adapter module for a source key."""
+    with _lock:
+        if source not in _adapters:
+            _adapters[source] = importlib.import_module(f".{_MODULES[source]}", __package__)
+        return _adapters[source]
+
+
+def fetch_source(platform: str, state) -> List[Dict[str, Any]]:
+    """Runs one platform's fetch and wraps payloads as raw_results items."""
+    source = SOURCES[platform][0]
+    payloads = get_adapter(source).fetch(state)
+    return [{"source": source, "payload": p} for p in payloads]
+
+
+def normalize_batch(raw_results: List[Dict[str, Any]]) -> List[Job]:
+    """Groups raw_results by source and normalizes each group in one call (fetch order kept per source)."""
+    by_source: Dict[str, List[Dict[str, Any]]] = {}
+    for item in raw_results:
+        by_source.setdefault(item["source"], []).append(item["payload"])
+
+    jobs = []
+    for source, payloads in by_source.items():
+        if source not in _MODULES:
+            print(f"⚠️ No adapter for source '{source}', skipping {len(payloads)} jobs.")
+            continue
+        try:
+            jobs.extend(get_adapter(source).normalize(payloads))
+        except Exception as e:
+            print(f"❌ Normalizing {source} failed: {e}")
+    return jobs
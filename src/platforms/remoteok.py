@@ -1,8 +1,12 @@
-import logging
-import requests
+import json
 from typing import List, Dict, Any
 
 from ..graph.state import JobState
+from ..models.job import Job
+from ..utils.cleaning import clean_html_many
+from . import http
+from .http_cache import get_conditional
+from .cursors import filter_new
 
 # RemoteOK requires a User-Agent to avoid 429/403 errors
 HEADERS = {
@@ -10,6 +14,10 @@ HEADERS = {
 }
 
 def fetch_from_remoteok(tag: str = "python") -> List[Dict[str, Any]]:
+    """Sync wrapper around `fetch_from_remoteok_async`."""
+    return http.run_async(fetch_from_remoteok_async(tag))
+
+async def fetch_from_remoteok_async(tag: str = "python") -> List[Dict[str, Any]]:
     """
     Fetches jobs from RemoteOK API.
     API behavior: Returns a list where [0] is legal info, [1..n] are jobs.
@@ -24,9 +32,12 @@ def fetch_from_remoteok(tag: str = "python") -> List[Dict[str, Any]]:
     print(f"📡 Connecting to RemoteOK API (tag='{clean_tag}')...")
     
     try:
-        response = requests.get(url, headers=HEADERS, params=params, timeout=10)
-        response.raise_for_status()
-        data = response.json()
+        # Conditional GET: a 304 means nothing changed since the last poll
+        cached = await get_conditional(url, params=params, headers=HEADERS, timeout=10)
+        if not cached.changed:
+            print("✅ RemoteOK unchanged since last fetch (304), skipping.")
+            return []
+        data = json.loads(cached.text)
         
         jobs = []
         for item in data:
@@ -49,22 +60,27 @@ def fetch_from_remoteok(tag: str = "python") -> List[Dict[str, Any]]:
             }
             jobs.append(job)
             
-        return jobs
+        # The API returns the whole feed at once; keep only postings since the last run
+        return filter_new("remoteok", clean_tag, jobs, lambda job: job.get("date"))
     
     except Exception as e:
         print(f"❌ RemoteOK Error: {e}")
         return []
 
-def fetch_remoteok(state: JobState):
+
+# --- Source adapter (see registry.py) ---
+SOURCE = "remoteok"
+
+def fetch(state: JobState) -> List[Dict[str, Any]]:
     query = state.get("search_query", "python")
-    
-    # 1. Execute the fetch
-    raw_jobs = fetch_from_remoteok(tag=query)
-    
-    # 2. Structure the data for the 'raw_results' list in state
-    results_wrapper = [
-        {"source": "remoteok", "payload": job} 
-        for job in raw_jobs
-    ]
-    
-    return {"raw_results": results_wrapper}
\ No newline at end of file
+    print(f"🌍 Fetching RemoteOK for '{query}'...")
+    return fetch_from_remoteok(tag=query)
+
+def normalize(payloads: List[Dict[str, Any]]) -> List[Job]:
+    descriptions = clean_html_many(p.get("description") for p in payloads)
+    jobs = []
+    for p, description in zip(payloads, descriptions):
+        try:
+            jobs.append(Job(id=str(p.get("id", p.get("url"))), platform="remoteok", title=p.get("position"), company=p.get("company"), description=description, url=p.get("url"), budget_min=float(p.get("salary_min") or 0), budget_max=float(p.get("salary_max") or 0), is_remote=True))
+        except Exception: continue
+    return jobs
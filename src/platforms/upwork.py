@@ -1,7 +1,11 @@
 import os
 from typing import Any, Dict, List, Optional
 
-import requests
+from ..graph.state import JobState
+from ..models.job import Job
+from ..utils.cleaning import clean_html_many
+from . import http
+from .cursors import fetch_new_pages
 
 TOKEN_URL = "https://www.upwork.com/api/v3/oauth2/token"
 GRAPHQL_URL = "https://api.upwork.com/graphql"
@@ -35,7 +39,7 @@ query publicMarketplaceJobPostingsSearch($marketPlaceJobFilter: PublicMarketplac
 """
 
 
-def _get_access_token() -> Optional[str]:
+async def _get_access_token() -> Optional[str]:
     """Return an Upwork access token from env or refresh token exchange."""
     env_access_token = os.getenv("UPWORK_ACCESS_TOKEN")
     if env_access_token:
@@ -60,7 +64,7 @@ def _get_access_token() -> Optional[str]:
     }
 
     try:
-        response = requests.post(TOKEN_URL, data=payload, timeout=20)
+        response = await http.post(TOKEN_URL, data=payload, timeout=20)
         response.raise_for_status()
         token_data = response.json()
     except Exception as exc:
@@ -91,9 +95,14 @@ def _build_upwork_job_url(ciphertext: str) -> str:
 
 
 def fetch_upwork_api(query: str = "python developer", rows: int = DEFAULT_ROWS) -> List[Dict[str, Any]]:
+    """Sync wrapper around `fetch_upwork_api_async`."""
+    return http.run_async(fetch_upwork_api_async(query, rows))
+
+
+async def fetch_upwork_api_async(query: str = "python developer", rows: int = DEFAULT_ROWS) -> List[Dict[str, Any]]:
     print(f"?? Connecting to Upwork API (query='{query}')...")
 
-    access_token = _get_access_token()
+    access_token = await _get_access_token()
     if not access_token:
         return []
 
@@ -106,12 +115,27 @@ def fetch_upwork_api(query: str = "python developer", rows: int = DEFAULT_ROWS)
     if tenant_id:
         headers["X-Upwork-API-TenantId"] = tenant_id
 
+    rows = max(1, min(rows, 100))
+    # The public search has no sort option, so pages can't be assumed to be
+    # newest first: read up to MAX_PAGES and keep postings since the cursor
+    jobs = await fetch_new_pages(
+        "upwork", query,
+        lambda page: _fetch_page(query, headers, rows, offset=page * rows),
+        lambda job: job.get("published"),
+        newest_first=False,
+    )
+    print(f"? Retrieved {len(jobs)} raw jobs from Upwork API.")
+    return jobs
+
+
+async def _fetch_page(query: str, headers: Dict[str, str], rows: int, offset: int = 0) -> Optional[List[Dict[str, Any]]]:
+    """One page of search results; None if the request failed."""
     variables = {
         "marketPlaceJobFilter": {
             "searchExpression_eq": query,
             "pagination": {
-                "offset": 0,
-                "count": max(1, min(rows, 100)),
+                "offset": offset,
+                "count": rows,
             },
         }
     }
@@ -122,18 +146,18 @@ def fetch_upwork_api(query: str = "python developer", rows: int = DEFAULT_ROWS)
     }
 
     try:
-        response = requests.post(GRAPHQL_URL, json=payload, headers=headers, timeout=30)
+        response = await http.post(GRAPHQL_URL, json=payload, headers=headers, timeout=30)
         response.raise_for_status()
         body = response.json()
     except Exception as exc:
         print(f"? Upwork GraphQL request failed: {exc}")
-        return []
+        return None
 
     if body.get("errors"):
         first_error = body["errors"][0]
         message = first_error.get("message", "Unknown GraphQL error")
         print(f"?? Upwork GraphQL error: {message}")
-        return []
+        return None
 
     jobs_data = (
         body.get("data", {})
@@ -164,5 +188,22 @@ def fetch_upwork_api(query: str = "python developer", rows: int = DEFAULT_ROWS)
             }
         )
 
-    print(f"? Retrieved {len(jobs)} raw jobs from Upwork API.")
+    return jobs
+
+
+# --- Source adapter (see registry.py) ---
+SOURCE = "upwork"
+
+def fetch(state: JobState) -> List[Dict[str, Any]]:
+    query = state.get("search_query", "python")
+    print(f"🌍 Fetching Upwork RSS for '{query}'...")
+    return fetch_upwork_api(query)
+
+def normalize(payloads: List[Dict[str, Any]]) -> List[Job]:
+    descriptions = clean_html_many(p.get("description") for p in payloads)
+    jobs = []
+    for p, description in zip(payloads, descriptions):
+        try:
+            jobs.append(Job(id=p.get("id"), platform="upwork", title=p.get("title"), company="Upwork Client", description=description, url=p.get("link"), budget_min=float(p.get("budget_min") or 0), budget_max=float(p.get("budget_max") or 0)))
+        except Exception: continue
     return jobs
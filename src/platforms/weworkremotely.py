@@ -1,18 +1,30 @@
+import asyncio
 import feedparser
-import ssl
 from typing import List, Dict, Any
 
-# Fix for SSL certificate errors
-if hasattr(ssl, '_create_unverified_context'):
-    ssl._create_default_https_context = ssl._create_unverified_context
+from ..graph.state import JobState
+from ..models.job import Job
+from ..utils.cleaning import clean_html_many
+from . import http
+from .http_cache import get_conditional
+from .cursors import filter_new
 
 RSS_URL = "https://weworkremotely.com/categories/remote-programming-jobs.rss"
 
 def fetch_weworkremotely(tag: str = None) -> List[Dict[str, Any]]:
+    """Sync wrapper around `fetch_weworkremotely_async`."""
+    return http.run_async(fetch_weworkremotely_async(tag))
+
+async def fetch_weworkremotely_async(tag: str = None) -> List[Dict[str, Any]]:
     print(f"📡 Connecting to WeWorkRemotely RSS...")
     
     try:
-        feed = feedparser.parse(RSS_URL)
+        # Conditional GET through the shared client; a 304 skips re-parsing
+        cached = await get_conditional(RSS_URL)
+        if not cached.changed:
+            print("✅ WeWorkRemotely feed unchanged since last fetch (304), skipping.")
+            return []
+        feed = await asyncio.to_thread(feedparser.parse, cached.text)
         jobs = []
         
         for entry in feed.entries:
@@ -41,8 +53,25 @@ def fetch_weworkremotely(tag: str = None) -> List[Dict[str, Any]]:
             jobs.append(job)
             
         print(f"✅ Retrieved {len(jobs)} raw jobs from WeWorkRemotely.")
-        return jobs
+        return filter_new("wwr", RSS_URL, jobs, lambda job: job.get("published"))
         
     except Exception as e:
         print(f"❌ WeWorkRemotely Failed: {e}")
-        return []
\ No newline at end of file
+        return []
+
+
+# --- Source adapter (see registry.py) ---
+SOURCE = "wwr"
+
+def fetch(state: JobState) -> List[Dict[str, Any]]:
+    print("🌍 Fetching WeWorkRemotely...")
+    return fetch_weworkremotely()
+
+def normalize(payloads: List[Dict[str, Any]]) -> List[Job]:
+    descriptions = clean_html_many(p.get("description") for p in payloads)
+    jobs = []
+    for p, description in zip(payloads, descriptions):
+        try:
+            jobs.append(Job(id=p.get("id"), platform="weworkremotely", title=p.get("title"), company=p.get("company"), description=description, url=p.get("link"), budget_min=0.0, budget_max=0.0))
+        except Exception: continue
+    return jobs
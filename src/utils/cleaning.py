@@ -1,16 +1,72 @@
+import html
 import re
-from typing import Tuple
+from typing import Dict, Iterable, List, Tuple
+
+# HTML -> plain text with a handful of C-level regex scans (no per-tag Python
+# callbacks): hidden blocks are dropped, block tags become paragraph/line
+# markers, remaining tags become spaces, then entities are decoded.
+_PARA, _LINE = "\x01", "\x00"  # Break markers, never present in cleaned input
+
+SKIP_RE = re.compile(
+    r"<(script|style|noscript|template|head)\b[^>]*>.*?</\1\s*>|<!--.*?-->|<![^>]*>|<\?[^>]*>",
+    re.S | re.I,
+)
+PARAGRAPH_TAG_RE = re.compile(
+    r"</?(?:p|div|section|article|header|footer|blockquote|pre|table|ul|ol|h[1-6])\b[^>]*>", re.I
+)
+LINE_TAG_RE = re.compile(r"</?(?:br|li|tr|dt|dd|hr)\b[^>]*>", re.I)
+TAG_RE = re.compile(r"<[^>]*>")
+ENTITY_RE = re.compile(r"&(?:#\d+|#[xX][0-9a-fA-F]+|[A-Za-z][A-Za-z0-9]{1,31});?")
+PARA_RUN_RE = re.compile(r"[ \x00]*\x01[ \x00\x01]*")
+LINE_RUN_RE = re.compile(r" ?\x00[ \x00]*")
+
+_entities: Dict[str, str] = {}
+
+
+def _decode_entity(m) -> str:
+    # Descriptions repeat the same few entities thousands of times
+    entity = m.group(0)
+    text = _entities.get(entity)
+    if text is None:
+        text = _entities[entity] = html.unescape(entity)
+    return text
+
+
+def _to_text(raw: str) -> str:
+    if _LINE in raw or _PARA in raw:
+        raw = raw.replace(_LINE, "").replace(_PARA, "")
+    text = SKIP_RE.sub("", raw)
+    text = PARAGRAPH_TAG_RE.sub(_PARA, text)
+    text = LINE_TAG_RE.sub(_LINE, text)
+    text = TAG_RE.sub(" ", text)
+    if "&" in text:
+        text = ENTITY_RE.sub(_decode_entity, text)
+    # Collapse whitespace, then merge each run of markers into its strongest break
+    text = " ".join(text.split())
+    text = LINE_RUN_RE.sub(_LINE, PARA_RUN_RE.sub(_PARA, text)).strip(_PARA + _LINE)
+    return text.replace(_PARA, "\n\n").replace(_LINE, "\n")
+
 
 def clean_html(raw_html: str) -> str:
-    """Removes HTML tags and cleans up whitespace."""
-    if not raw_html:
-        return ""
-    # Remove HTML tags
-    clean = re.sub(r'<[^>]+>', ' ', raw_html)
-    # Decode HTML entities (basic)
-    clean = clean.replace("&amp;", "&").replace("&nbsp;", " ").replace("&gt;", ">").replace("&lt;", "<")
-    # Collapse multiple spaces
-    return " ".join(clean.split())
+    """Converts HTML to plain text (all entities decoded, script/style dropped, paragraph breaks kept)."""
+    return clean_html_many([raw_html])[0]
+
+
+def clean_html_many(raw_htmls: Iterable[str]) -> List[str]:
+    """Batch version of clean_html for the normalizer. Identical inputs are only converted once."""
+    done: Dict[str, str] = {}
+    out = []
+    for raw in raw_htmls:
+        if not raw:
+            out.append("")
+            continue
+        if raw not in done:
+            if "<" not in raw and "&" not in raw:
+                done[raw] = " ".join(raw.split())  # Plain text, nothing to parse
+            else:
+                done[raw] = _to_text(raw)
+        out.append(done[raw])
+    return out
 
 def parse_salary(salary_str: str) -> Tuple[float, float]:
     """
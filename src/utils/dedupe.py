@@ -0,0 +1,181 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from ..models.job import Job
+from .history import HISTORY_DB, HISTORY_TTL_DAYS
+from .ranking import tokenize
+
+# Cross-platform near-duplicate detection (64-bit SimHash).
+# Each job gets two fingerprints:
+#   head - title + company (every source has these)
+#   body - description word 3-gram shingles (only when the description
+#          is real text, LinkedIn's guest API only returns a stub)
+# Two jobs are duplicates when their heads are within NEAR_DUP_HEAD_DISTANCE
+# bits and, if both have a body, the bodies are within NEAR_DUP_BODY_DISTANCE.
+# Jobs with no real company (Freelancer/Upwork placeholders) and no body are
+# never collapsed: a title alone can't tell two separate gigs apart.
+# Fingerprints are kept in the history DB so cross-posts are caught across runs.
+
+NEAR_DUP_HEAD_DISTANCE = int(os.getenv("NEAR_DUP_HEAD_DISTANCE", "3"))
+NEAR_DUP_BODY_DISTANCE = int(os.getenv("NEAR_DUP_BODY_DISTANCE", "12"))
+MIN_BODY_TOKENS = 40  # Shorter descriptions are treated as stubs
+MASK64 = (1 << 64) - 1
+BANDS = 4             # 4 x 16-bit bands: heads within 3 bits share at least one band
+
+PLACEHOLDER_COMPANIES = {"", "unknown", "freelancer client", "upwork client"}
+COMPANY_SUFFIXES = {"inc", "llc", "ltd", "limited", "gmbh", "corp", "corporation", "co", "company", "plc", "pvt", "bv", "sa", "ag"}
+
+
+def _hash64(feature: str) -> int:
+    return int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def simhash(features: Iterable[Tuple[str, float]]) -> int:
+    """64-bit SimHash of weighted features."""
+    features = list(features)
+    if not features: return 0
+    hashes = np.array([_hash64(f) for f, _ in features], dtype="<u8")
+    weights = np.array([w for _, w in features], dtype=float)
+    # (n, 64) bit matrix, bit 0 first
+    bits = np.unpackbits(hashes.view(np.uint8).reshape(-1, 8), axis=1, bitorder="little")
+    totals = weights @ (bits.astype(float) * 2 - 1)
+    packed = np.packbits((totals > 0).astype(np.uint8), bitorder="little")
+    return int(packed.view("<u8")[0]) & MASK64
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def _bands(fp: int) -> List[int]:
+    width = 64 // BANDS
+    return [(fp >> (i * width)) & ((1 << width) - 1) for i in range(BANDS)]
+
+
+def _to_signed(fp: Optional[int]) -> Optional[int]:
+    # SQLite INTEGER is signed 64-bit
+    return fp - (1 << 64) if fp is not None and fp >= 1 << 63 else fp
+
+
+def _to_unsigned(fp: Optional[int]) -> Optional[int]:
+    return fp + (1 << 64) if fp is not None and fp < 0 else fp
+
+
+def fingerprint(job: Job) -> Optional[Tuple[int, Optional[int]]]:
+    """
+    (head, body) fingerprints for a job; body is None for stub descriptions.
+    None when the job can't be compared (placeholder company and a stub body).
+    """
+    title = tokenize(job.title or "")
+    raw_company = (getattr(job, "company", "") or "").strip()
+    company = [] if raw_company.lower() in PLACEHOLDER_COMPANIES else [t for t in tokenize(raw_company) if t not in COMPANY_SUFFIXES]
+    head_features = [(f"t:{t}", 1.0) for t in title] + [(f"c:{t}", 1.0) for t in company]
+    head = simhash(head_features)
+
+    words = tokenize(job.description or "")[:2000]
+    if len(words) < MIN_BODY_TOKENS:
+        return (head, None) if company else None
+    # Title/company are already compared through the head
+    body = simhash((" ".join(words[i:i + 3]), 1.0) for i in range(len(words) - 2))
+    return head, body
+
+
+class FingerprintIndex:
+    """Recent fingerprints, banded in memory, persisted next to the seen-store."""
+
+    def __init__(self, db_path: str = HISTORY_DB, ttl_days: float = HISTORY_TTL_DAYS):
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS fingerprints ("
+            " job_id TEXT PRIMARY KEY, head INTEGER NOT NULL, body INTEGER, seen_at REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_fingerprints_seen_at ON fingerprints (seen_at)")
+        if ttl_days:
+            self.conn.execute("DELETE FROM fingerprints WHERE seen_at < ?", (time.time() - ttl_days * 86400,))
+        self.conn.commit()
+
+        self.entries: Dict[str, Tuple[int, Optional[int]]] = {}
+        self.bands: List[Dict[int, List[str]]] = [{} for _ in range(BANDS)]
+        for job_id, head, body in self.conn.execute("SELECT job_id, head, body FROM fingerprints"):
+            self._index(job_id, _to_unsigned(head), _to_unsigned(body))
+
+    def _index(self, job_id: str, head: int, body: Optional[int]):
+        self.entries[job_id] = (head, body)
+        for i, band in enumerate(_bands(head)):
+            self.bands[i].setdefault(band, []).append(job_id)
+
+    def find(self, job_id: str, head: int, body: Optional[int]) -> Optional[str]:
+        """Id of an indexed near-duplicate from a different job, if any."""
+        candidates = set()
+        for i, band in enumerate(_bands(head)):
+            candidates.update(self.bands[i].get(band, ()))
+        candidates.discard(job_id)  # Same job seen again is not a cross-post
+        for other in candidates:
+            other_head, other_body = self.entries[other]
+            if hamming(head, other_head) > NEAR_DUP_HEAD_DISTANCE: continue
+            if body is not None and other_body is not None and hamming(body, other_body) > NEAR_DUP_BODY_DISTANCE: continue
+            return other
+        return None
+
+    def add_many(self, items: List[Tuple[str, int, Optional[int]]]):
+        if not items: return
+        now = time.time()
+        with self.lock:
+            for job_id, head, body in items:
+                if job_id not in self.entries: self._index(job_id, head, body)
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO fingerprints (job_id, head, body, seen_at) VALUES (?, ?, ?, ?)",
+                [(job_id, _to_signed(head), _to_signed(body), now) for job_id, head, body in items],
+            )
+            self.conn.commit()
+
+
+_index: Optional[FingerprintIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_fingerprint_index() -> FingerprintIndex:
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = FingerprintIndex()
+        return _index
+
+
+def collapse_near_duplicates(jobs: List[Job]) -> List[Job]:
+    """
+    Drops jobs that are near-duplicates of one seen earlier in this batch or
+    in a recent run, and records the survivors' fingerprints.
+    """
+    if not jobs: return jobs
+    index = get_fingerprint_index()
+    unique, new_entries, dropped = [], [], 0
+
+    with index.lock:
+        for job in jobs:
+            job_id = str(job.id)
+            fp = fingerprint(job)
+            if fp is None:
+                unique.append(job)  # Nothing reliable to compare on
+                continue
+            head, body = fp
+            if index.find(job_id, head, body):
+                dropped += 1
+                continue
+            if job_id not in index.entries:
+                index._index(job_id, head, body)  # Catch duplicates later in the same batch
+                new_entries.append((job_id, head, body))
+            unique.append(job)
+    index.add_many(new_entries)
+
+    if dropped:
+        print(f"🧬 Collapsed {dropped} near-duplicate cross-posts.")
+    return unique
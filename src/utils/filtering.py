@@ -1,35 +1,138 @@
-from typing import List
+import re
+from functools import lru_cache
+from typing import Dict, List, Set, Tuple
 from ..models.job import Job
 
+# Must-have syntax (one entry per keyword):
+#   "Python"          -> whole-word match ("Java" does not match "JavaScript")
+#   "React|Vue"       -> OR group, any alternative satisfies it
+#   "-WordPress"      -> exclude: jobs mentioning it are dropped
+# Each term also matches its SYNONYMS. All terms are compiled into one regex
+# and evaluated in a single pass over the text.
+
+SYNONYMS = {
+    "javascript": ["js"],
+    "typescript": ["ts"],
+    "postgres": ["postgresql"],
+    "postgresql": ["postgres"],
+    "kubernetes": ["k8s"],
+    "k8s": ["kubernetes"],
+    "node": ["node.js", "nodejs"],
+    "node.js": ["node", "nodejs"],
+    "nodejs": ["node", "node.js"],
+    "ml": ["machine learning"],
+    "machine learning": ["ml"],
+    "ai": ["artificial intelligence"],
+    "aws": ["amazon web services"],
+    "gcp": ["google cloud"],
+    "react": ["react.js", "reactjs"],
+    "vue": ["vue.js", "vuejs"],
+}
+
+TRUSTED_PLATFORMS = ["google_search", "freelancer"]  # Snippet-only descriptions, skip must-haves
+
+# Characters that glue onto a token ("c++", "c#", "node.js"), so they count as "inside a word"
+_WORD = r"a-z0-9+#"
+
+
+def _phrase_pattern(phrase: str) -> str:
+    return r"\s+".join(re.escape(part) for part in phrase.split())
+
+
+class KeywordFilter:
+    """Must-have keywords compiled once into a single boundary-aware regex."""
+
+    def __init__(self, must_haves: Tuple[str, ...]):
+        self.required: List[Set[str]] = []  # Each group is satisfied by any of its phrases
+        self.excluded: Set[str] = set()
+
+        for raw in must_haves:
+            term = " ".join(raw.lower().split())
+            if not term: continue
+            exclude = term.startswith("-") and len(term) > 1
+            if exclude: term = term[1:].strip()
+
+            phrases = set()
+            for alt in term.split("|"):
+                alt = alt.strip()
+                if not alt: continue
+                phrases.add(alt)
+                phrases.update(SYNONYMS.get(alt, []))
+            if not phrases: continue
+
+            if exclude: self.excluded |= phrases
+            else: self.required.append(phrases)
+
+        all_phrases = set(self.excluded).union(*self.required)
+        # Longest first so multi-word phrases win over their prefixes
+        ordered = sorted(all_phrases, key=len, reverse=True)
+        self.regex = None
+        if ordered:
+            alternation = "|".join(_phrase_pattern(p) for p in ordered)
+            self.regex = re.compile(rf"(?<![{_WORD}])(?:{alternation})(?![{_WORD}])")
+
+        # A long match can hide shorter phrases inside it ("react native" contains "react")
+        self.contains: Dict[str, Set[str]] = {}
+        for p in ordered:
+            inner = re.compile(rf"(?<![{_WORD}]){_phrase_pattern(p)}(?![{_WORD}])")
+            for longer in ordered:
+                if longer != p and len(longer) > len(p) and inner.search(longer):
+                    self.contains.setdefault(longer, set()).add(p)
+
+    def found(self, text: str) -> Set[str]:
+        """Every phrase present in the text, from one regex pass."""
+        if self.regex is None: return set()
+        hits = set()
+        for m in self.regex.finditer(text.lower()):
+            phrase = " ".join(m.group(0).split())
+            hits.add(phrase)
+            hits |= self.contains.get(phrase, set())
+        return hits
+
+    def is_excluded(self, hits: Set[str]) -> bool:
+        return bool(hits & self.excluded)
+
+    def satisfied(self, hits: Set[str]) -> bool:
+        return not self.is_excluded(hits) and all(group & hits for group in self.required)
+
+    def matches(self, text: str) -> bool:
+        return self.satisfied(self.found(text))
+
+
+@lru_cache(maxsize=32)
+def compile_keywords(must_haves: Tuple[str, ...]) -> KeywordFilter:
+    return KeywordFilter(must_haves)
+
+
 def strict_keyword_filter(jobs: List[Job], must_haves: List[str]) -> List[Job]:
     """
-    Filters jobs based on must-have keywords.
-    EXCEPTION: Google Search results are skipped (trusted) because they only have snippets.
+    Filters jobs based on must-have keywords (see the syntax at the top of this file).
+    EXCEPTION: Google Search results are skipped (trusted) because they only have snippets;
+    exclude terms still apply to them.
     """
     if not must_haves:
         return jobs
 
     print(f"🕵️ Applying Hard Filter: Must contain {must_haves}")
-    
+    keyword_filter = compile_keywords(tuple(must_haves))
+
     filtered = []
     dropped_count = 0
-    
+
     for job in jobs:
-        # --- LOGIC START ---
-        # 1. Trust Google Search & Freelancer (because descriptions are too short)
-        if job.platform in ["google_search", "freelancer"]:
-            filtered.append(job)
-            continue
-        # -------------------
+        hits = keyword_filter.found(job.title + " " + job.description)
 
+        # 1. Trust Google Search & Freelancer (because descriptions are too short)
+        if job.platform in TRUSTED_PLATFORMS:
+            keep = not keyword_filter.is_excluded(hits)
         # 2. For others (RemoteOK, WWR), check full description
-        text_to_check = (job.title + " " + job.description).lower()
-        
-        # Check if ALL keywords exist
-        if all(keyword.lower() in text_to_check for keyword in must_haves):
+        else:
+            keep = keyword_filter.satisfied(hits)
+
+        if keep:
             filtered.append(job)
         else:
             dropped_count += 1
 
     print(f"📉 Filter dropped {dropped_count} jobs.")
-    return filtered
\ No newline at end of file
+    return filtered
@@ -1,98 +1,66 @@
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
-import os
-import json
-import pandas as pd
 from datetime import datetime
 from ..models.job import Job # <--- Need this to convert dicts back to Job objects
+from .local_store import get_local_store
+from .sheets_client import get_spreadsheet
+from . import sheets_sync
+from .loader_cache import cached_loader, invalidate
 
 def get_sheet_connection(sheet_url=None):
-    if not sheet_url:
-        sheet_url = os.getenv("GOOGLE_SHEET_URL")
-        if not sheet_url: return None
+    """Cached spreadsheet handle (see sheets_client.py)."""
+    return get_spreadsheet(sheet_url)
 
-    scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
-    
-    creds_dict = None
-    if os.getenv("GOOGLE_CREDENTIALS_JSON"):
-        try: creds_dict = json.loads(os.getenv("GOOGLE_CREDENTIALS_JSON"))
-        except: pass
-    elif os.path.exists("credentials.json"):
-        try: creds_dict = json.load(open("credentials.json"))
-        except: pass
-        
-    if not creds_dict: return None
-
-    try:
-        creds = ServiceAccountCredentials.from_json_keyfile_dict(creds_dict, scope)
-        client = gspread.authorize(creds)
-        return client.open_by_url(sheet_url)
-    except: return None
+def match_row(job):
+    return [
+        str(job.id),
+        job.title,
+        getattr(job, "company", "Unknown"),
+        job.platform,
+        job.url,
+        str(job.posted_at) if job.posted_at else datetime.now().strftime("%Y-%m-%d"),
+        str(job.relevance_score),
+        job.reasoning
+    ]
 
-def log_jobs_to_sheet(jobs, sheet_url):
-    """Logs a list of Job objects to the 'New_Matches' tab."""
-    if not jobs: return
+def log_jobs_to_sheet(jobs):
+    """
+    Logs a list of Job objects to the 'New_Matches' tab (write-behind).
+    Rows go to the local store and the durable sync outbox, and the function
+    returns right away; the replicator appends them to the Sheet at
+    GOOGLE_SHEET_URL in coalesced append_rows calls, retrying with backoff.
+    """
+    if not jobs: return 0
 
     try:
-        sh = get_sheet_connection(sheet_url)
-        if not sh: return
-
-        try:
-            worksheet = sh.worksheet("New_Matches")
-        except gspread.exceptions.WorksheetNotFound:
-            worksheet = sh.add_worksheet(title="New_Matches", rows="100", cols="10")
-
-        # ENFORCE HEADERS
-        headers = ["ID", "Title", "Company", "Platform", "URL", "Date Posted", "Score", "Reasoning"]
-        first_row = []
-        try: first_row = worksheet.row_values(1)
-        except: pass
-        
-        if not first_row or first_row[0] != "ID":
-            worksheet.insert_row(headers, index=1)
-
-        # Append Unique Jobs
-        existing_ids = set(worksheet.col_values(1))
-        new_rows = []
-        for job in jobs:
-            if str(job.id) not in existing_ids:
-                row = [
-                    str(job.id),
-                    job.title,
-                    getattr(job, "company", "Unknown"),
-                    job.platform,
-                    job.url,
-                    str(job.posted_at) if job.posted_at else datetime.now().strftime("%Y-%m-%d"),
-                    str(job.relevance_score),
-                    job.reasoning
-                ]
-                new_rows.append(row)
-        
-        if new_rows:
-            worksheet.append_rows(new_rows)
-            print(f"✅ Logged {len(new_rows)} jobs to 'New_Matches'.")
-
+        store = get_local_store()
+        queued = 0
+        with store.transaction() as conn:
+            for job in jobs:
+                if store.exists("New_Matches", job.id): continue
+                row = match_row(job)
+                store.upsert(conn, "New_Matches", row)
+                store.enqueue(conn, "New_Matches", "append", row)
+                queued += 1
+        if queued:
+            invalidate("New_Matches")
+            sheets_sync.kick()
+            print(f"📥 Queued {queued} jobs for 'New_Matches'.")
+        return queued
     except Exception as e:
-        print(f"❌ Google Sheets Error: {e}")
+        print(f"❌ Match Spool Error: {e}")
+        return 0
 
 # --- NEW FUNCTIONS ---
 
+@cached_loader("New_Matches")
 def load_new_matches():
-    """Reads all jobs from 'New_Matches' tab and returns Job objects."""
+    """Reads all jobs from the local 'New_Matches' table and returns Job objects."""
     try:
-        sh = get_sheet_connection()
-        if not sh: return []
-        
-        try:
-            worksheet = sh.worksheet("New_Matches")
-        except: return [] # Tab doesn't exist yet
-
-        data = worksheet.get_all_records()
+        sheets_sync.ensure_fresh("New_Matches")
+        data = get_local_store().load("New_Matches")
         jobs = []
         
         for d in data:
-            # Helper to safely get keys (handles case sensitivity issues)
-            def g(k): return str(d.get(k) or d.get(k.lower()) or "")
+            def g(k): return str(d.get(k) or "")
 
             j = Job(
                 id=g("ID"),
@@ -116,16 +84,20 @@ def load_new_matches():
         return []
 
 def delete_new_match(job_id):
-    """Deletes a job from 'New_Matches' tab."""
+    """Deletes a job locally and queues the delete for the 'New_Matches' tab."""
+    delete_new_matches([job_id])
+
+def delete_new_matches(job_ids):
+    """Bulk dismiss. The replicator removes all rows with one batch request."""
+    if not job_ids: return
     try:
-        sh = get_sheet_connection()
-        if not sh: return
-        
-        worksheet = sh.worksheet("New_Matches")
-        cell = worksheet.find(str(job_id), in_column=1)
-        
-        if cell:
-            worksheet.delete_rows(cell.row)
-            print(f"✅ Deleted ID {job_id} from New_Matches")
+        store = get_local_store()
+        with store.transaction() as conn:
+            for job_id in job_ids:
+                store.delete(conn, "New_Matches", job_id)
+                store.enqueue(conn, "New_Matches", "delete", {"id": str(job_id)})
+        invalidate("New_Matches")
+        sheets_sync.kick()
+        print(f"✅ Deleted {len(job_ids)} job(s) from New_Matches")
     except Exception as e:
-        print(f"❌ Delete Error: {e}")
\ No newline at end of file
+        print(f"❌ Delete Error: {e}")
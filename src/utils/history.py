@@ -1,28 +1,227 @@
+import hashlib
 import json
+import math
 import os
-from typing import Set
+import sqlite3
+import threading
+import time
+from typing import Any, Iterable, List, Optional, Set
+
+# Seen-job store: an indexed SQLite table (WAL journal, insert-only writes)
+# plus an in-memory Bloom filter so "never seen" checks skip the disk.
+# Rows older than HISTORY_TTL_DAYS are compacted away.
+
+HISTORY_DB = os.getenv("HISTORY_DB", "job_history.db")
+HISTORY_FILE = "job_history.json"  # Legacy format, imported once on first open
+HISTORY_TTL_DAYS = float(os.getenv("HISTORY_TTL_DAYS", "90"))
+ALERT_TTL_DAYS = float(os.getenv("ALERT_TTL_DAYS", "30"))  # A job can be alerted again after this
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter (no false negatives, ~`error_rate` false positives)."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        capacity = max(1, capacity)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, int(round(self.size / capacity * math.log(2))))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str):
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class SeenStore:
+    def __init__(self, db_path: str = HISTORY_DB, ttl_days: float = HISTORY_TTL_DAYS):
+        self.db_path = db_path
+        self.ttl_days = ttl_days
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS seen (id TEXT PRIMARY KEY, seen_at REAL NOT NULL)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_seen_at ON seen (seen_at)")
+        self.conn.commit()
+        self.bloom: Optional[BloomFilter] = None
+        self._import_legacy_json()
+        self.compact()
+        self._build_bloom()
+
+    def _import_legacy_json(self):
+        """One-time import of the old job_history.json list."""
+        if not os.path.exists(HISTORY_FILE) or len(self):
+            return
+        try:
+            with open(HISTORY_FILE, "r") as f:
+                self.add_many(json.load(f))
+            print(f"📦 Imported {len(self)} ids from {HISTORY_FILE} into {self.db_path}.")
+        except Exception as e:
+            print(f"⚠️ Could not import {HISTORY_FILE}: {e}")
+
+    def _build_bloom(self):
+        count = len(self)
+        bloom = BloomFilter(capacity=max(100_000, count * 2))
+        for (job_id,) in self.conn.execute("SELECT id FROM seen"):
+            bloom.add(job_id)
+        self.bloom = bloom
+
+    def __contains__(self, job_id) -> bool:
+        if not job_id:
+            return False
+        job_id = str(job_id)
+        # Fast negative path: the Bloom filter never misses a stored id
+        if self.bloom is not None and job_id not in self.bloom:
+            return False
+        with self.lock:
+            row = self.conn.execute("SELECT 1 FROM seen WHERE id = ?", (job_id,)).fetchone()
+        return row is not None
+
+    def add(self, job_id):
+        self.add_many([job_id])
+
+    def add_many(self, job_ids: Iterable):
+        ids = [str(j) for j in job_ids if j]
+        if not ids:
+            return
+        now = time.time()
+        with self.lock:
+            self.conn.executemany("INSERT OR IGNORE INTO seen (id, seen_at) VALUES (?, ?)", [(j, now) for j in ids])
+            self.conn.commit()
+        if self.bloom is not None:
+            for j in ids:
+                self.bloom.add(j)
+
+    def compact(self):
+        """Drops ids older than the TTL (the Bloom filter is rebuilt on next open)."""
+        if not self.ttl_days:
+            return 0
+        cutoff = time.time() - self.ttl_days * 86400
+        with self.lock:
+            cur = self.conn.execute("DELETE FROM seen WHERE seen_at < ?", (cutoff,))
+            self.conn.commit()
+        return cur.rowcount
+
+    def __len__(self) -> int:
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+
+
+_store: Optional[SeenStore] = None
+_store_lock = threading.Lock()
+
+
+def get_seen_store() -> SeenStore:
+    """Process-wide seen store (opened lazily)."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = SeenStore()
+        return _store
+
+
+class AlertLedger:
+    """
+    Jobs already sent as alerts (by id and by URL), shared by every entry
+    point through HISTORY_DB so a job that reappears is not notified or
+    re-scored again until ALERT_TTL_DAYS have passed.
+    """
+
+    def __init__(self, db_path: str = HISTORY_DB, ttl_days: float = ALERT_TTL_DAYS):
+        self.ttl_days = ttl_days
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS alerted (key TEXT PRIMARY KEY, alerted_at REAL NOT NULL)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_alerted_at ON alerted (alerted_at)")
+        if ttl_days:
+            self.conn.execute("DELETE FROM alerted WHERE alerted_at < ?", (time.time() - ttl_days * 86400,))
+
+    @staticmethod
+    def _keys(job: Any) -> List[str]:
+        return [str(k) for k in (job.id, job.url) if k]
+
+    def _cutoff(self) -> float:
+        return time.time() - self.ttl_days * 86400 if self.ttl_days else 0.0
+
+    def __contains__(self, key) -> bool:
+        if not key:
+            return False
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT 1 FROM alerted WHERE key = ? AND alerted_at >= ?", (str(key), self._cutoff())
+            ).fetchone()
+        return row is not None
+
+    def was_alerted(self, job: Any) -> bool:
+        return any(key in self for key in self._keys(job))
+
+    def claim(self, jobs: List[Any]) -> List[Any]:
+        """
+        Records the jobs that have not been alerted yet and returns them, in one
+        write transaction, so two runs at the same time never both alert a job.
+        """
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                cutoff, now, claimed, keys = self._cutoff(), time.time(), [], set()
+                for job in jobs:
+                    job_keys = self._keys(job)
+                    if not job_keys or keys.intersection(job_keys): continue
+                    marks = ", ".join("?" * len(job_keys))
+                    if self.conn.execute(
+                        f"SELECT 1 FROM alerted WHERE key IN ({marks}) AND alerted_at >= ?", (*job_keys, cutoff)
+                    ).fetchone():
+                        continue
+                    self.conn.executemany("INSERT OR REPLACE INTO alerted (key, alerted_at) VALUES (?, ?)", [(k, now) for k in job_keys])
+                    keys.update(job_keys)
+                    claimed.append(job)
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+        return claimed
+
+    def release(self, jobs: List[Any]):
+        """Undoes a claim (the alerts could not be queued)."""
+        with self.lock:
+            self.conn.executemany("DELETE FROM alerted WHERE key = ?", [(k,) for job in jobs for k in self._keys(job)])
+
+
+_ledger: Optional[AlertLedger] = None
+_ledger_lock = threading.Lock()
+
+
+def get_alert_ledger() -> AlertLedger:
+    global _ledger
+    with _ledger_lock:
+        if _ledger is None:
+            _ledger = AlertLedger()
+        return _ledger
 
-HISTORY_FILE = "job_history.json"
 
 def load_history() -> Set[str]:
-    """Loads the set of processed Job IDs from the local JSON file."""
-    if not os.path.exists(HISTORY_FILE):
-        return set()
+    """Returns every processed Job ID as a set. Prefer `get_seen_store()` for lookups."""
     try:
-        with open(HISTORY_FILE, "r") as f:
-            data = json.load(f)
-            return set(data)
+        store = get_seen_store()
+        with store.lock:
+            return {row[0] for row in store.conn.execute("SELECT id FROM seen")}
     except Exception:
         return set()
 
+
 def save_to_history(job_id: str):
-    """Adds a single Job ID to history and saves to file."""
-    history = load_history()
-    if job_id not in history:
-        history.add(job_id)
-        with open(HISTORY_FILE, "w") as f:
-            json.dump(list(history), f)
+    """Records a single Job ID (insert-only, never rewrites the store)."""
+    get_seen_store().add(job_id)
+
 
 def get_history_stats():
     """Returns count of tracked jobs."""
-    return len(load_history())
\ No newline at end of file
+    return len(get_seen_store())
@@ -0,0 +1,104 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Optional
+
+# Small durable key/value cache (SQLite, stdlib only) used for LLM results.
+# Entries live in one table, partitioned by namespace, with a TTL and a
+# per-namespace size cap (oldest entries are evicted first).
+
+CACHE_DB = os.getenv("HUSTLEBOT_CACHE_DB", "hustlebot_cache.db")
+
+
+def content_hash(*parts: Any) -> str:
+    """Stable sha256 over the given parts (used for content-addressed keys)."""
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(str(part if part is not None else "").encode("utf-8"))
+        h.update(b"\x1f")
+    return h.hexdigest()
+
+
+class KVCache:
+    def __init__(self, namespace: str, ttl_seconds: float, max_entries: int, db_path: Optional[str] = None):
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.db_path = db_path or CACHE_DB
+        self._init_db()
+
+    @contextmanager
+    def _connect(self):
+        """Opens a short-lived connection and commits on success."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _init_db(self):
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS kv_cache ("
+                " namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL,"
+                " created_at REAL NOT NULL, PRIMARY KEY (namespace, key))"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_kv_cache_age ON kv_cache (namespace, created_at)")
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Returns {key: value} for every key that is cached and not expired."""
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+        cutoff = time.time() - self.ttl_seconds
+        found = {}
+        with self._connect() as conn:
+            # Stay well under SQLite's bound-parameter limit
+            for i in range(0, len(keys), 500):
+                chunk = keys[i : i + 500]
+                marks = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT key, value FROM kv_cache WHERE namespace = ? AND created_at >= ? AND key IN ({marks})",
+                    [self.namespace, cutoff, *chunk],
+                ).fetchall()
+                for key, value in rows:
+                    found[key] = json.loads(value)
+        return found
+
+    def get(self, key: str) -> Optional[Any]:
+        return self.get_many([key]).get(key)
+
+    def put_many(self, items: Dict[str, Any]):
+        if not items:
+            return
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO kv_cache (namespace, key, value, created_at) VALUES (?, ?, ?, ?)",
+                [(self.namespace, k, json.dumps(v), now) for k, v in items.items()],
+            )
+            self._evict(conn)
+
+    def put(self, key: str, value: Any):
+        self.put_many({key: value})
+
+    def _evict(self, conn: sqlite3.Connection):
+        """Drops expired entries, then the oldest ones beyond max_entries."""
+        conn.execute(
+            "DELETE FROM kv_cache WHERE namespace = ? AND created_at < ?",
+            (self.namespace, time.time() - self.ttl_seconds),
+        )
+        conn.execute(
+            "DELETE FROM kv_cache WHERE namespace = ? AND key IN ("
+            " SELECT key FROM kv_cache WHERE namespace = ? ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+            (self.namespace, self.namespace, self.max_entries),
+        )
+
+    def __len__(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM kv_cache WHERE namespace = ?", (self.namespace,)).fetchone()[0]
@@ -0,0 +1,48 @@
+import copy
+import functools
+import os
+import threading
+import time
+from typing import Any, Dict, Tuple
+
+# In-process cache for the dashboard loaders (load_applications,
+# load_manual_jobs, load_cover_letters, load_new_matches).
+# Streamlit re-runs the whole script on every click, so results are kept per
+# tab for LOADER_CACHE_TTL seconds and dropped as soon as a save/delete/update
+# or a Sheets pull touches that tab.
+
+LOADER_CACHE_TTL = float(os.getenv("LOADER_CACHE_TTL", "60"))
+
+_lock = threading.Lock()
+_entries: Dict[Tuple[str, str], Tuple[float, Any]] = {}  # (tab, loader) -> (loaded_at, result)
+
+
+def cached_loader(tab: str, ttl: float = None):
+    """Caches a zero-argument loader's result under `tab` for `ttl` seconds."""
+    def decorate(fn):
+        key = (tab, fn.__qualname__)
+
+        @functools.wraps(fn)
+        def wrapper():
+            max_age = LOADER_CACHE_TTL if ttl is None else ttl
+            with _lock:
+                hit = _entries.get(key)
+            if hit and time.time() - hit[0] < max_age:
+                # Callers mutate jobs (scores, gap analysis), so never hand out the cached objects
+                return copy.deepcopy(hit[1])
+
+            result = fn()
+            with _lock:
+                _entries[key] = (time.time(), result)
+            return copy.deepcopy(result)
+
+        return wrapper
+    return decorate
+
+
+def invalidate(*tabs: str):
+    """Drops cached results for the given tabs (all tabs if none are given)."""
+    with _lock:
+        for key in list(_entries):
+            if not tabs or key[0] in tabs:
+                del _entries[key]
@@ -0,0 +1,197 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+# Local system of record for the dashboard data (tracker, manual jobs,
+# cover letters, new matches). Google Sheets is only a replication target:
+# every local write also queues an op in `sync_outbox`, which the background
+# replicator in sheets_sync.py pushes to the matching tab.
+
+STORE_DB = os.getenv("HUSTLEBOT_DB", "hustlebot.db")
+
+# Sheet tab -> (table, sheet headers, table columns). The first column is the key.
+TABS = {
+    "Tracker": (
+        "tracker",
+        ["ID", "Title", "Company", "Platform", "URL", "Date Applied", "Status", "Notes"],
+        ["id", "title", "company", "platform", "url", "date_applied", "status", "notes"],
+    ),
+    "Manual_Jobs": (
+        "manual_jobs",
+        ["ID", "Title", "Company", "Description", "URL", "Score", "Reason", "Gap Analysis"],
+        ["id", "title", "company", "description", "url", "score", "reason", "gap_analysis"],
+    ),
+    "Cover_Letters": (
+        "cover_letters",
+        ["Job ID", "Date Created", "Content"],
+        ["job_id", "date_created", "content"],
+    ),
+    "New_Matches": (
+        "new_matches",
+        ["ID", "Title", "Company", "Platform", "URL", "Date Posted", "Score", "Reasoning"],
+        ["id", "title", "company", "platform", "url", "date_posted", "score", "reasoning"],
+    ),
+}
+
+
+def headers_for(tab: str) -> List[str]:
+    return TABS[tab][1]
+
+
+class LocalStore:
+    def __init__(self, db_path: str = STORE_DB):
+        self.db_path = db_path
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self._init_schema()
+
+    def _init_schema(self):
+        with self.transaction() as conn:
+            for table, _, columns in TABS.values():
+                cols = ", ".join(f"{c} TEXT" + (" PRIMARY KEY" if i == 0 else "") for i, c in enumerate(columns))
+                conn.execute(f"CREATE TABLE IF NOT EXISTS {table} ({cols}, updated_at REAL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_tracker_status ON tracker (status)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sync_outbox ("
+                " seq INTEGER PRIMARY KEY AUTOINCREMENT, tab TEXT NOT NULL, op TEXT NOT NULL,"
+                " payload TEXT NOT NULL, created_at REAL NOT NULL, attempts INTEGER DEFAULT 0)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sync_meta ("
+                " tab TEXT PRIMARY KEY, last_pulled REAL DEFAULT 0, local_version INTEGER DEFAULT 0)"
+            )
+
+    @contextmanager
+    def transaction(self):
+        """Serialised read-modify-write; commits on success, rolls back on error."""
+        with self.lock:
+            try:
+                yield self.conn
+                self.conn.commit()
+            except Exception:
+                self.conn.rollback()
+                raise
+
+    # --- Rows (keyed by sheet headers, like gspread's get_all_records) ---
+    def load(self, tab: str, where: str = "", params: tuple = ()) -> List[Dict[str, Any]]:
+        table, headers, columns = TABS[tab]
+        with self.lock:
+            rows = self.conn.execute(f"SELECT {', '.join(columns)} FROM {table} {where}", params).fetchall()
+        return [{h: (r[c] if r[c] is not None else "") for h, c in zip(headers, columns)} for r in rows]
+
+    def exists(self, tab: str, key: str) -> bool:
+        table, _, columns = TABS[tab]
+        with self.lock:
+            return self.conn.execute(f"SELECT 1 FROM {table} WHERE {columns[0]} = ?", (str(key),)).fetchone() is not None
+
+    def upsert(self, conn: sqlite3.Connection, tab: str, row: List[Any]):
+        table, _, columns = TABS[tab]
+        marks = ", ".join("?" * (len(columns) + 1))
+        conn.execute(
+            f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}, updated_at) VALUES ({marks})",
+            [str(v) if v is not None else "" for v in row] + [time.time()],
+        )
+        self._bump_version(conn, tab)
+
+    def update_fields(self, conn: sqlite3.Connection, tab: str, key: str, fields: Dict[str, Any]):
+        table, _, columns = TABS[tab]
+        sets = ", ".join(f"{c} = ?" for c in fields)
+        conn.execute(
+            f"UPDATE {table} SET {sets}, updated_at = ? WHERE {columns[0]} = ?",
+            [str(v) for v in fields.values()] + [time.time(), str(key)],
+        )
+        self._bump_version(conn, tab)
+
+    def delete(self, conn: sqlite3.Connection, tab: str, key: str):
+        table, _, columns = TABS[tab]
+        conn.execute(f"DELETE FROM {table} WHERE {columns[0]} = ?", (str(key),))
+        self._bump_version(conn, tab)
+
+    def replace_all(self, tab: str, rows: List[List[Any]], expected_version: int) -> bool:
+        """
+        Replaces a table with rows pulled from Sheets. Skipped (returns False)
+        if the table changed locally since `expected_version` or has unpushed ops.
+        """
+        table, _, columns = TABS[tab]
+        with self.transaction() as conn:
+            if self.local_version(tab) != expected_version or self.has_pending(tab):
+                return False
+            conn.execute(f"DELETE FROM {table}")
+            marks = ", ".join("?" * (len(columns) + 1))
+            now = time.time()
+            conn.executemany(
+                f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}, updated_at) VALUES ({marks})",
+                [[str(v) if v is not None else "" for v in row] + [now] for row in rows if row and row[0]],
+            )
+            conn.execute(
+                "INSERT INTO sync_meta (tab, last_pulled) VALUES (?, ?)"
+                " ON CONFLICT(tab) DO UPDATE SET last_pulled = excluded.last_pulled",
+                (tab, now),
+            )
+        return True
+
+    # --- Sync bookkeeping ---
+    def _bump_version(self, conn: sqlite3.Connection, tab: str):
+        conn.execute(
+            "INSERT INTO sync_meta (tab, local_version) VALUES (?, 1)"
+            " ON CONFLICT(tab) DO UPDATE SET local_version = local_version + 1",
+            (tab,),
+        )
+
+    def local_version(self, tab: str) -> int:
+        with self.lock:
+            row = self.conn.execute("SELECT local_version FROM sync_meta WHERE tab = ?", (tab,)).fetchone()
+        return row[0] if row else 0
+
+    def last_pulled(self, tab: str) -> float:
+        with self.lock:
+            row = self.conn.execute("SELECT last_pulled FROM sync_meta WHERE tab = ?", (tab,)).fetchone()
+        return row[0] if row else 0.0
+
+    def enqueue(self, conn: sqlite3.Connection, tab: str, op: str, payload: Any):
+        """Queues a Sheets mutation in the same transaction as the local write."""
+        conn.execute(
+            "INSERT INTO sync_outbox (tab, op, payload, created_at) VALUES (?, ?, ?, ?)",
+            (tab, op, json.dumps(payload), time.time()),
+        )
+
+    def pending_ops(self, limit: int = 200) -> List[Dict[str, Any]]:
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT seq, tab, op, payload, attempts FROM sync_outbox ORDER BY seq LIMIT ?", (limit,)
+            ).fetchall()
+        return [{"seq": r["seq"], "tab": r["tab"], "op": r["op"], "payload": json.loads(r["payload"]), "attempts": r["attempts"]} for r in rows]
+
+    def has_pending(self, tab: Optional[str] = None) -> bool:
+        with self.lock:
+            if tab:
+                row = self.conn.execute("SELECT 1 FROM sync_outbox WHERE tab = ? LIMIT 1", (tab,)).fetchone()
+            else:
+                row = self.conn.execute("SELECT 1 FROM sync_outbox LIMIT 1").fetchone()
+        return row is not None
+
+    def ack(self, seqs: List[int]):
+        with self.transaction() as conn:
+            conn.executemany("DELETE FROM sync_outbox WHERE seq = ?", [(s,) for s in seqs])
+
+    def mark_failed(self, seqs: List[int]):
+        with self.transaction() as conn:
+            conn.executemany("UPDATE sync_outbox SET attempts = attempts + 1 WHERE seq = ?", [(s,) for s in seqs])
+
+
+_store: Optional[LocalStore] = None
+_store_lock = threading.Lock()
+
+
+def get_local_store() -> LocalStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = LocalStore()
+        return _store
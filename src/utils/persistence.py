@@ -1,10 +1,9 @@
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
-import os
-import json
-import pandas as pd
 from datetime import datetime
 from ..models.job import Job
+from .local_store import get_local_store
+from .sheets_client import get_spreadsheet
+from . import sheets_sync
+from .loader_cache import cached_loader, invalidate
 from dotenv import load_dotenv  
 
 
@@ -12,86 +11,53 @@ load_dotenv()
 
 # --- CONNECTION SETUP ---
 def get_sheet_connection():
-    scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
-    creds_dict = None
-    if os.getenv("GOOGLE_CREDENTIALS_JSON"):
-        try: creds_dict = json.loads(os.getenv("GOOGLE_CREDENTIALS_JSON"))
-        except: return None
-    elif os.path.exists("credentials.json"):
-        try: creds_dict = json.load(open("credentials.json"))
-        except: return None
-    if not creds_dict: return None
+    """Cached spreadsheet handle (see sheets_client.py)."""
+    return get_spreadsheet()
 
-    try:
-        creds = ServiceAccountCredentials.from_json_keyfile_dict(creds_dict, scope)
-        client = gspread.authorize(creds)
-        sheet_url = os.getenv("GOOGLE_SHEET_URL")
-        if not sheet_url: return None
-        return client.open_by_url(sheet_url)
-    except Exception as e:
-        print(f"❌ Connection Error: {e}")
-        return None
+# Reads and writes go to the local SQLite store (src/utils/local_store.py);
+# each write also queues a Sheets op that sheets_sync pushes in the background.
 
 # --- 1. TRACKER ---
 def save_application(job_obj, status="Applied"):
     try:
-        sh = get_sheet_connection()
-        if not sh: return
-        try: worksheet = sh.worksheet("Tracker")
-        except: worksheet = sh.add_worksheet(title="Tracker", rows="100", cols="10")
-        
-        # Header Check
-        headers = ["ID", "Title", "Company", "Platform", "URL", "Date Applied", "Status", "Notes"]
-        vals = worksheet.get_all_values()
-        if not vals or vals[0][0] != "ID":
-            worksheet.insert_row(headers, index=1)
-
-        if str(job_obj.id) in worksheet.col_values(1): return
-
+        store = get_local_store()
         row = [str(job_obj.id), job_obj.title, getattr(job_obj, "company", "Unknown"), job_obj.platform, job_obj.url, datetime.now().strftime("%Y-%m-%d"), status, ""]
-        worksheet.append_row(row)
+        with store.transaction() as conn:
+            if store.exists("Tracker", job_obj.id): return
+            store.upsert(conn, "Tracker", row)
+            store.enqueue(conn, "Tracker", "append", row)
+        invalidate("Tracker")
+        sheets_sync.kick()
         print(f"✅ Tracked: {job_obj.title}")
     except Exception as e: print(f"❌ Tracker Error: {e}")
 
+@cached_loader("Tracker")
 def load_applications():
     try:
-        sh = get_sheet_connection()
-        if not sh: return []
-        return sh.worksheet("Tracker").get_all_records()
+        sheets_sync.ensure_fresh("Tracker")
+        return get_local_store().load("Tracker")
     except: return []
 
 def update_status(job_id, new_status):
+    update_statuses({job_id: new_status})
+
+def update_statuses(statuses):
+    """Bulk status change: {job_id: new_status}. Pushed to Sheets as one batch_update."""
+    if not statuses: return
     try:
-        sh = get_sheet_connection()
-        if not sh: return
-        ws = sh.worksheet("Tracker")
-        cell = ws.find(str(job_id), in_column=1)
-        if cell: ws.update_cell(cell.row, 7, new_status)
+        store = get_local_store()
+        with store.transaction() as conn:
+            for job_id, new_status in statuses.items():
+                store.update_fields(conn, "Tracker", job_id, {"status": new_status})
+                store.enqueue(conn, "Tracker", "update", {"id": str(job_id), "fields": {"Status": new_status}})
+        invalidate("Tracker")
+        sheets_sync.kick()
     except: pass
 
 # --- 2. MANUAL JOBS (Updated) ---
 def save_manual_job(job):
     try:
-        sh = get_sheet_connection()
-        if not sh: return
-
-        try:
-            worksheet = sh.worksheet("Manual_Jobs")
-        except:
-            worksheet = sh.add_worksheet(title="Manual_Jobs", rows="100", cols="10")
-
-        # ENFORCE HEADERS
-        headers = ["ID", "Title", "Company", "Description", "URL", "Score", "Reason", "Gap Analysis"]
-        
-        # Check first row
-        first_row = []
-        try: first_row = worksheet.row_values(1)
-        except: pass
-        
-        if not first_row or first_row[0] != "ID":
-            print("📝 Adding Headers to Manual_Jobs...")
-            worksheet.insert_row(headers, index=1)
-
+        store = get_local_store()
         row = [
             str(job.id),
             job.title,
@@ -102,24 +68,24 @@ def save_manual_job(job):
             job.reasoning,
             getattr(job, "gap_analysis", "")
         ]
-        worksheet.append_row(row)
+        with store.transaction() as conn:
+            store.upsert(conn, "Manual_Jobs", row)
+            store.enqueue(conn, "Manual_Jobs", "append", row)
+        invalidate("Manual_Jobs")
+        sheets_sync.kick()
         print(f"✅ Saved Manual Job: {job.title}")
 
     except Exception as e:
         print(f"❌ Manual Save Error: {e}")
 
+@cached_loader("Manual_Jobs")
 def load_manual_jobs():
     try:
-        sh = get_sheet_connection()
-        if not sh: return []
-        try: worksheet = sh.worksheet("Manual_Jobs")
-        except: return []
-        
-        data = worksheet.get_all_records()
+        sheets_sync.ensure_fresh("Manual_Jobs")
+        data = get_local_store().load("Manual_Jobs")
         jobs = []
         for d in data:
-            # Helper to safely get keys (case-insensitive fallback)
-            def g(k): return d.get(k) or d.get(k.lower()) or ""
+            def g(k): return d.get(k) or ""
             
             j = Job(id=str(g("ID")), platform="Manual Entry", title=g("Title"), company=g("Company"), description=g("Description"), url=g("URL"), budget_min=0, budget_max=0, is_remote=True)
             try: j.relevance_score = int(float(g("Score")))
@@ -131,77 +97,56 @@ def load_manual_jobs():
     except: return []
 
 def delete_manual_job(job_id):
+    delete_manual_jobs([job_id])
+
+def delete_manual_jobs(job_ids):
+    """Bulk delete. Pushed to Sheets as one batch request."""
+    if not job_ids: return
     try:
-        sh = get_sheet_connection()
-        if not sh: return
-        ws = sh.worksheet("Manual_Jobs")
-        cell = ws.find(str(job_id), in_column=1)
-        if cell: ws.delete_rows(cell.row)
+        store = get_local_store()
+        with store.transaction() as conn:
+            for job_id in job_ids:
+                store.delete(conn, "Manual_Jobs", job_id)
+                store.enqueue(conn, "Manual_Jobs", "delete", {"id": str(job_id)})
+        invalidate("Manual_Jobs")
+        sheets_sync.kick()
     except: pass
 
-# ... (keep existing imports and functions) ...
-
-# --- 3. COVER LETTERS (REAL IMPLEMENTATION) ---
+# --- 3. COVER LETTERS ---
 def save_cover_letter(job_id, content):
-    """Saves the cover letter text to the 'Cover_Letters' tab."""
+    """Saves the cover letter text locally and queues it for the 'Cover_Letters' tab."""
+    save_cover_letters({job_id: content})
+
+def save_cover_letters(letters):
+    """Bulk upsert: {job_id: content}. Pushed to Sheets as one batch_update + one append."""
+    if not letters: return
     try:
-        sh = get_sheet_connection()
-        if not sh: return
-
-        # 1. Get or Create Tab
-        try:
-            worksheet = sh.worksheet("Cover_Letters")
-        except:
-            worksheet = sh.add_worksheet(title="Cover_Letters", rows="100", cols="5")
-            
-        # 2. Ensure Headers
-        first_row = []
-        try: first_row = worksheet.row_values(1)
-        except: pass
-        
-        if not first_row or first_row[0] != "Job ID":
-            worksheet.insert_row(["Job ID", "Date Created", "Content"], index=1)
-
-        # 3. Check if Draft Exists (Update vs Append)
-        cell = worksheet.find(str(job_id), in_column=1)
-        
-        if cell:
-            # Update existing row (Content is in Col 3)
-            worksheet.update_cell(cell.row, 3, content)
-            # Update date (Col 2)
-            worksheet.update_cell(cell.row, 2, datetime.now().strftime("%Y-%m-%d %H:%M"))
-            print(f"✅ Updated Draft for {job_id}")
-        else:
-            # Append new row
-            row = [
-                str(job_id),
-                datetime.now().strftime("%Y-%m-%d %H:%M"),
-                content
-            ]
-            worksheet.append_row(row)
-            print(f"✅ Saved New Draft for {job_id}")
+        store = get_local_store()
+        created = datetime.now().strftime("%Y-%m-%d %H:%M")
+        with store.transaction() as conn:
+            for job_id, content in letters.items():
+                row = [str(job_id), created, content]
+                store.upsert(conn, "Cover_Letters", row)
+                store.enqueue(conn, "Cover_Letters", "upsert", row)
+        invalidate("Cover_Letters")
+        sheets_sync.kick()
+        print(f"✅ Saved {len(letters)} draft(s)")
 
     except Exception as e:
         print(f"❌ Cover Letter Save Error: {e}")
 
+@cached_loader("Cover_Letters")
 def load_cover_letters():
     """Returns a dict {job_id: content} of all saved drafts."""
     try:
-        sh = get_sheet_connection()
-        if not sh: return {}
-        
-        try: worksheet = sh.worksheet("Cover_Letters")
-        except: return {}
-
-        data = worksheet.get_all_records()
+        sheets_sync.ensure_fresh("Cover_Letters")
         letters = {}
-        for d in data:
-            # Handle case sensitivity in headers
-            jid = str(d.get("Job ID") or d.get("job id") or "")
-            content = d.get("Content") or d.get("content") or ""
+        for d in get_local_store().load("Cover_Letters"):
+            jid = str(d.get("Job ID") or "")
+            content = d.get("Content") or ""
             if jid and content:
                 letters[jid] = content
         return letters
     except Exception as e:
         print(f"❌ Error loading letters: {e}")
-        return {}
\ No newline at end of file
+        return {}
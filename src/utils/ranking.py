@@ -0,0 +1,108 @@
+import math
+import os
+import re
+from collections import Counter
+from typing import Dict, List, Tuple
+
+from ..models.job import Job
+
+# Offline lexical pre-ranker (TF-IDF cosine similarity, no network).
+# Ranks normalized jobs against profile.md so only the most promising ones
+# are sent to the LLM scorer; the rest get a cheap heuristic score.
+
+PRERANK_TOP_N = int(os.getenv("PRERANK_TOP_N", "50"))                     # Max jobs sent to the LLM
+# Optional cosine cutoff (0-1). Off by default: raw TF-IDF cosines against a
+# full profile are small (relevant jobs land around 0.05-0.1) and IDF
+# down-weights the skills most postings share, so a fixed cutoff drops good
+# matches. Only set it after checking `prerank_score` on your own runs.
+PRERANK_MIN_SIMILARITY = float(os.getenv("PRERANK_MIN_SIMILARITY", "0"))
+HEURISTIC_MAX_SCORE = 50  # Locally ranked jobs stay well below the 80+ alert threshold
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have", "in", "is", "it",
+    "its", "of", "on", "or", "our", "that", "the", "their", "this", "to", "we", "will", "with", "you",
+    "your", "i", "my", "me", "am", "was", "were", "not", "but", "all", "can", "who", "what", "us",
+}
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in TOKEN_RE.findall((text or "").lower()) if t not in STOPWORDS and len(t) > 1]
+
+
+def _job_text(job: Job) -> str:
+    # Title counts twice: it is the strongest signal and descriptions can be stubs
+    return f"{job.title} {job.title} {job.description}"
+
+
+def _weights(counts: Counter, idf: Dict[str, float]) -> Tuple[Dict[str, float], float]:
+    """Sublinear tf * idf vector and its norm."""
+    vec = {t: (1.0 + math.log(c)) * idf.get(t, 1.0) for t, c in counts.items()}
+    norm = math.sqrt(sum(w * w for w in vec.values()))
+    return vec, norm
+
+
+def rank_jobs(jobs: List[Job], profile_text: str) -> List[Job]:
+    """
+    Sets job.prerank_score (cosine similarity to the profile, 0-1) on every
+    job and returns them best match first.
+    """
+    if not jobs:
+        return []
+
+    docs = [Counter(tokenize(_job_text(j))) for j in jobs]
+    profile_counts = Counter(tokenize(profile_text))
+
+    # IDF over the job corpus plus the profile
+    df = Counter()
+    for counts in docs:
+        df.update(counts.keys())
+    df.update(profile_counts.keys())
+    n_docs = len(docs) + 1
+    idf = {t: math.log((n_docs + 1) / (d + 1)) + 1.0 for t, d in df.items()}
+
+    profile_vec, profile_norm = _weights(profile_counts, idf)
+
+    for job, counts in zip(jobs, docs):
+        vec, norm = _weights(counts, idf)
+        if not norm or not profile_norm:
+            job.prerank_score = 0.0
+            continue
+        dot = sum(w * profile_vec[t] for t, w in vec.items() if t in profile_vec)
+        job.prerank_score = dot / (norm * profile_norm)
+
+    return sorted(jobs, key=lambda j: j.prerank_score, reverse=True)
+
+
+def select_for_llm(jobs: List[Job], top_n: int = None, min_similarity: float = None, budget: int = None) -> Tuple[List[Job], List[Job]]:
+    """
+    Splits pre-ranked jobs into (shortlist for the LLM, rest).
+    The shortlist is the top `top_n` jobs at or above `min_similarity`,
+    further capped at `budget` (may be 0) when given.
+    The rest get a heuristic score/reasoning so they still show up ranked.
+    """
+    top_n = PRERANK_TOP_N if top_n is None else top_n
+    min_similarity = PRERANK_MIN_SIMILARITY if min_similarity is None else min_similarity
+
+    ordered = sorted(jobs, key=lambda j: j.prerank_score, reverse=True)
+    best = ordered[0].prerank_score if ordered else 0.0
+    if best > 0:
+        shortlist = [j for j in ordered if j.prerank_score >= min_similarity]
+    else:
+        # Nothing to rank on (no profile / jobs never pre-ranked): keep the old behaviour
+        shortlist = list(ordered)
+    if top_n > 0:
+        shortlist = shortlist[:top_n]
+    if budget is not None:
+        shortlist = shortlist[:max(0, budget)]
+
+    for job in shortlist:
+        job.shortlisted = True
+    chosen = {id(j) for j in shortlist}
+    rest = [j for j in ordered if id(j) not in chosen]
+
+    for job in rest:
+        job.relevance_score = int(round(HEURISTIC_MAX_SCORE * job.prerank_score / best)) if best else 0
+        job.reasoning = f"Pre-ranked locally (similarity {job.prerank_score:.2f}); not sent to AI scoring."
+
+    return shortlist, rest
@@ -0,0 +1,69 @@
+import asyncio
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+    `capacity` tokens refill continuously over `period` seconds, so
+    TokenBucket(15, 60) allows a burst of 15 and then 15 per minute.
+    """
+
+    def __init__(self, capacity: float, period: float = 60.0):
+        self.capacity = float(capacity)
+        self.rate = self.capacity / period
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self, amount: float = 1.0) -> float:
+        """Takes `amount` tokens if available. Returns 0, or the seconds to wait before retrying."""
+        amount = min(float(amount), self.capacity)
+        with self.lock:
+            self._refill()
+            if self.tokens >= amount:
+                self.tokens -= amount
+                return 0.0
+            return (amount - self.tokens) / self.rate
+
+    def acquire(self, amount: float = 1.0):
+        """Blocks until `amount` tokens have been taken."""
+        while True:
+            wait = self.try_acquire(amount)
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+    async def acquire_async(self, amount: float = 1.0):
+        """Like `acquire`, but waits with asyncio.sleep (for use on an event loop)."""
+        while True:
+            wait = self.try_acquire(amount)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+
+class RateLimiter:
+    """Requests-per-minute + tokens-per-minute quota (e.g. Gemini's RPM/TPM limits)."""
+
+    def __init__(self, rpm: float, tpm: Optional[float] = None):
+        self.requests = TokenBucket(rpm, 60.0)
+        self.tokens = TokenBucket(tpm, 60.0) if tpm else None
+
+    def acquire(self, tokens: int = 0):
+        """Blocks until one request carrying roughly `tokens` tokens fits in both quotas."""
+        self.requests.acquire(1)
+        if self.tokens and tokens:
+            self.tokens.acquire(tokens)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (~4 characters per token for English prose)."""
+    return len(text or "") // 4 + 1
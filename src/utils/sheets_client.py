@@ -0,0 +1,131 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import gspread
+from oauth2client.service_account import ServiceAccountCredentials
+
+# Process-wide Google Sheets connection manager.
+# Credentials are parsed and authorized once, the spreadsheet is opened once
+# per URL and worksheet handles are cached by tab name, so callers don't pay
+# the auth + open round trips on every action. The client is rebuilt only
+# when the access token has expired or the credentials/URL change.
+
+SCOPE = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
+
+
+def _load_creds_dict() -> Optional[dict]:
+    if os.getenv("GOOGLE_CREDENTIALS_JSON"):
+        try: return json.loads(os.getenv("GOOGLE_CREDENTIALS_JSON"))
+        except: return None
+    elif os.path.exists("credentials.json"):
+        try:
+            with open("credentials.json") as f: return json.load(f)
+        except: return None
+    return None
+
+
+class SheetsConnectionManager:
+    def __init__(self):
+        self.lock = threading.RLock()
+        self._creds = None
+        self._creds_fingerprint = None
+        self._client = None
+        self._spreadsheets: Dict[str, gspread.Spreadsheet] = {}
+        self._worksheets: Dict[Tuple[str, str], gspread.Worksheet] = {}
+
+    def _token_expired(self) -> bool:
+        return bool(getattr(self._creds, "access_token_expired", False))
+
+    def client(self):
+        """Authorized gspread client (None if no credentials are configured)."""
+        with self.lock:
+            creds_dict = _load_creds_dict()
+            if not creds_dict:
+                return None
+            fingerprint = hashlib.sha1(json.dumps(creds_dict, sort_keys=True).encode()).hexdigest()
+
+            if self._client is None or fingerprint != self._creds_fingerprint or self._token_expired():
+                self._creds = ServiceAccountCredentials.from_json_keyfile_dict(creds_dict, SCOPE)
+                self._client = gspread.authorize(self._creds)
+                self._creds_fingerprint = fingerprint
+                # Handles hold a reference to the old client
+                self._spreadsheets.clear()
+                self._worksheets.clear()
+            return self._client
+
+    def spreadsheet(self, sheet_url: Optional[str] = None):
+        sheet_url = sheet_url or os.getenv("GOOGLE_SHEET_URL")
+        if not sheet_url:
+            return None
+        with self.lock:
+            client = self.client()
+            if client is None:
+                return None
+            if sheet_url not in self._spreadsheets:
+                self._spreadsheets[sheet_url] = client.open_by_url(sheet_url)
+            return self._spreadsheets[sheet_url]
+
+    def worksheet(self, tab: str, headers: Optional[List[str]] = None, create: bool = True,
+                  rows: str = "100", cols: str = "10", sheet_url: Optional[str] = None):
+        """
+        Cached worksheet handle. With `create`, a missing tab is added; with
+        `headers`, row 1 is checked (once per handle) and inserted if missing.
+        Raises gspread.exceptions.WorksheetNotFound when the tab is missing and create=False.
+        """
+        sheet_url = sheet_url or os.getenv("GOOGLE_SHEET_URL")
+        with self.lock:
+            sh = self.spreadsheet(sheet_url)
+            if sh is None:
+                return None
+            key = (sheet_url, tab)
+            if key in self._worksheets:
+                return self._worksheets[key]
+
+            try:
+                ws = sh.worksheet(tab)
+            except gspread.exceptions.WorksheetNotFound:
+                if not create: raise
+                ws = sh.add_worksheet(title=tab, rows=rows, cols=cols)
+
+            if headers:
+                first_row = []
+                try: first_row = ws.row_values(1)
+                except: pass
+                if not first_row or first_row[0] != headers[0]:
+                    ws.insert_row(headers, index=1)
+
+            self._worksheets[key] = ws
+            return ws
+
+    def invalidate(self, tab: Optional[str] = None):
+        """Drops cached worksheet handles (all, or one tab) after an error."""
+        with self.lock:
+            if tab is None:
+                self._worksheets.clear()
+            else:
+                for key in [k for k in self._worksheets if k[1] == tab]:
+                    del self._worksheets[key]
+
+
+_manager = SheetsConnectionManager()
+
+
+def get_spreadsheet(sheet_url: Optional[str] = None):
+    """Cached spreadsheet handle, or None if Sheets isn't configured / reachable."""
+    try:
+        return _manager.spreadsheet(sheet_url)
+    except Exception as e:
+        print(f"❌ Connection Error: {e}")
+        return None
+
+
+def get_worksheet(tab: str, headers: Optional[List[str]] = None, create: bool = True,
+                  rows: str = "100", cols: str = "10", sheet_url: Optional[str] = None):
+    return _manager.worksheet(tab, headers=headers, create=create, rows=rows, cols=cols, sheet_url=sheet_url)
+
+
+def invalidate(tab: Optional[str] = None):
+    _manager.invalidate(tab)
@@ -0,0 +1,301 @@
+import atexit
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Set, Tuple
+
+import gspread
+from gspread.utils import rowcol_to_a1
+
+from .local_store import TABS, get_local_store, headers_for
+from . import loader_cache, sheets_client
+from .sheets_client import get_spreadsheet
+
+# Background replicator: pushes queued local writes (sync_outbox) to the
+# Google Sheet tabs and periodically pulls each tab back into the local
+# store, so the dashboard never waits on the Sheets API.
+
+SYNC_INTERVAL = float(os.getenv("SHEETS_SYNC_INTERVAL", "5"))      # Seconds between outbox drains
+PULL_INTERVAL = float(os.getenv("SHEETS_PULL_INTERVAL", "600"))    # Seconds before a tab is re-pulled
+MAX_BACKOFF = 300
+MAX_ATTEMPTS = int(os.getenv("SHEETS_SYNC_MAX_ATTEMPTS", "8"))  # Then the op is dropped
+
+
+def _connect():
+    return get_spreadsheet()
+
+
+def get_worksheet(tab: str, cols: str = "10"):
+    """Cached handle for the tab, created with headers if needed."""
+    return sheets_client.get_worksheet(tab, headers=headers_for(tab), cols=cols)
+
+
+def _row_positions(ws) -> Dict[str, int]:
+    """{id: sheet row number} from a single read of column A."""
+    positions = {}
+    for i, value in enumerate(ws.col_values(1), start=1):
+        positions.setdefault(str(value), i)
+    return positions
+
+
+def _latest_by_id(payloads: List[Any], key=lambda p: p[0]) -> Dict[str, Any]:
+    """Coalesces payloads for the same id, last write wins (dict keeps first-seen order)."""
+    latest = {}
+    for payload in payloads:
+        latest[str(key(payload))] = payload
+    return latest
+
+
+# --- Push handlers: (tab, op) -> fn(tab, payloads). Raise on failure. ---
+# Consecutive queued ops of the same kind are coalesced into one call, so
+# each handler resolves rows with one column read and writes in one request.
+_handlers: Dict[Tuple[str, str], Callable[[str, List[Any]], None]] = {}
+
+
+def handler(tab: str, op: str):
+    def register(fn):
+        _handlers[(tab, op)] = fn
+        return fn
+    return register
+
+
+# IDs known to be in a tab, so spooled appends don't re-read column A every flush
+_known_ids: Dict[str, Set[str]] = {}
+
+
+def _forget_known_ids(tab: str):
+    _known_ids.pop(tab, None)
+
+
+def _known_ids_for(ws, tab: str) -> Set[str]:
+    if tab not in _known_ids:
+        _known_ids[tab] = set(ws.col_values(1))
+    return _known_ids[tab]
+
+
+@handler("Tracker", "append")
+@handler("New_Matches", "append")
+def _push_unique_append(tab, rows):
+    ws = get_worksheet(tab)
+    known = _known_ids_for(ws, tab)
+    new_rows = [row for row in _latest_by_id(rows).values() if str(row[0]) not in known]
+    if new_rows:
+        ws.append_rows(new_rows)
+        known.update(str(row[0]) for row in new_rows)
+
+
+@handler("Manual_Jobs", "append")
+def _push_append(tab, rows):
+    ws = get_worksheet(tab)
+    ws.append_rows(list(_latest_by_id(rows).values()))
+
+
+@handler("Tracker", "update")
+def _push_tracker_update(tab, payloads):
+    ws = get_worksheet(tab)
+    positions = _row_positions(ws)
+    headers = headers_for(tab)
+    data = []
+    for payload in payloads:
+        row = positions.get(str(payload["id"]))
+        if not row: continue
+        for header, value in payload["fields"].items():
+            data.append({"range": rowcol_to_a1(row, headers.index(header) + 1), "values": [[value]]})
+    if data: ws.batch_update(data)
+
+
+@handler("Manual_Jobs", "delete")
+@handler("New_Matches", "delete")
+def _push_delete(tab, payloads):
+    try: ws = sheets_client.get_worksheet(tab, create=False)
+    except gspread.exceptions.WorksheetNotFound: return  # No tab, nothing to delete
+    positions = _row_positions(ws)
+    rows = sorted({positions[str(p["id"])] for p in payloads if str(p["id"]) in positions}, reverse=True)
+    if not rows: return
+    known = _known_ids.get(tab)
+    if known is not None:
+        known.difference_update(str(p["id"]) for p in payloads)
+    # Bottom-up so earlier deletes don't shift the later indices
+    requests = [
+        {"deleteDimension": {"range": {"sheetId": ws.id, "dimension": "ROWS", "startIndex": r - 1, "endIndex": r}}}
+        for r in rows
+    ]
+    ws.spreadsheet.batch_update({"requests": requests})
+
+
+@handler("Cover_Letters", "upsert")
+def _push_cover_letters(tab, rows):
+    ws = get_worksheet(tab, cols="5")
+    positions = _row_positions(ws)
+    updates, new_rows = [], []
+    for row in _latest_by_id(rows).values():
+        pos = positions.get(str(row[0]))
+        if pos:
+            # Date is in Col 2, content in Col 3
+            updates.append({"range": f"B{pos}:C{pos}", "values": [[row[1], row[2]]]})
+        else:
+            new_rows.append(row)
+    if updates: ws.batch_update(updates)
+    if new_rows: ws.append_rows(new_rows)
+
+
+def _is_quota_error(e: Exception) -> bool:
+    response = getattr(e, "response", None)
+    return isinstance(e, gspread.exceptions.APIError) and getattr(response, "status_code", None) == 429
+
+
+# --- Pull: Sheet tab -> local table ---
+def pull_tab(tab: str) -> bool:
+    """Replaces the local table with the tab's rows (skipped if there are unpushed local changes)."""
+    store = get_local_store()
+    version = store.local_version(tab)
+    headers = headers_for(tab)
+    _forget_known_ids(tab)  # The tab may have been edited by hand
+    try:
+        records = sheets_client.get_worksheet(tab, create=False).get_all_records()
+    except gspread.exceptions.WorksheetNotFound:
+        records = []  # Tab doesn't exist yet
+
+    rows = []
+    for d in records:
+        # Helper to safely get keys (handles case sensitivity issues)
+        rows.append([d.get(h) if d.get(h) not in (None, "") else d.get(h.lower(), "") for h in headers])
+    replaced = store.replace_all(tab, rows, version)
+    if replaced:
+        loader_cache.invalidate(tab)
+    return replaced
+
+
+class Replicator:
+    def __init__(self):
+        self.wake = threading.Event()
+        self.drain_lock = threading.Lock()
+        self.pull_requests = set()
+        self.thread = None
+        self.backoff = 0.0
+
+    def start(self):
+        if self.thread is None or not self.thread.is_alive():
+            self.thread = threading.Thread(target=self._run, name="hustlebot-sheets-sync", daemon=True)
+            self.thread.start()
+
+    def kick(self):
+        """Wakes the replicator (starting it if needed)."""
+        self.start()
+        self.wake.set()
+
+    def request_pull(self, tab: str):
+        self.pull_requests.add(tab)
+        self.kick()
+
+    def _run(self):
+        while True:
+            self.wake.wait(timeout=SYNC_INTERVAL + self.backoff)
+            self.wake.clear()
+            try:
+                if self.push_pending():
+                    self._pull_requested()
+            except Exception as e:
+                print(f"⚠️ Sheets sync error: {e}")
+
+    def push_pending(self) -> bool:
+        """Pushes queued ops in order. Returns True once the outbox is empty."""
+        store = get_local_store()
+        with self.drain_lock:
+            ops = store.pending_ops()
+            if not ops: return True
+            if not _connect(): return False  # Offline / Sheets not configured: keep ops queued
+
+            i = 0
+            while i < len(ops):
+                # Coalesce a run of queued ops of the same kind into one batch
+                kind = (ops[i]["tab"], ops[i]["op"])
+                group = [ops[i]]
+                while i + len(group) < len(ops) and (ops[i + len(group)]["tab"], ops[i + len(group)]["op"]) == kind:
+                    group.append(ops[i + len(group)])
+                i += len(group)
+                seqs = [item["seq"] for item in group]
+
+                fn = _handlers.get(kind)
+                if fn is None:
+                    print(f"⚠️ Dropping unknown sync op {kind[0]}/{kind[1]}")
+                    store.ack(seqs)
+                    continue
+                try:
+                    fn(kind[0], [item["payload"] for item in group])
+                    store.ack(seqs)
+                except Exception as e:
+                    sheets_client.invalidate(kind[0])  # Handle may be stale (tab renamed/deleted)
+                    _forget_known_ids(kind[0])
+                    self.backoff = min(MAX_BACKOFF, max(SYNC_INTERVAL, self.backoff * 2))
+                    if _is_quota_error(e):
+                        # Rate limited: keep everything queued, don't count it as a failed attempt
+                        print(f"⏳ Sheets quota hit, retrying {kind[0]}/{kind[1]} in {self.backoff:.0f}s")
+                        return False
+                    if max(item["attempts"] for item in group) + 1 >= MAX_ATTEMPTS:
+                        print(f"❌ Giving up on {len(group)} {kind[0]}/{kind[1]} ops after {MAX_ATTEMPTS} attempts: {e}")
+                        store.ack(seqs)
+                        continue
+                    store.mark_failed(seqs)
+                    print(f"⚠️ Sheets sync failed for {kind[0]}/{kind[1]} (retrying in {self.backoff:.0f}s): {e}")
+                    return False
+
+            self.backoff = 0.0
+            return not store.has_pending()
+
+    def _pull_requested(self):
+        if not self.pull_requests: return
+        if not _connect(): return
+        while self.pull_requests:
+            tab = self.pull_requests.pop()
+            try: pull_tab(tab)
+            except Exception as e: print(f"⚠️ Sheets pull failed for {tab}: {e}")
+
+    def flush(self, timeout: float = 30.0) -> bool:
+        """Blocks until the outbox is pushed (or timeout). Used at exit by cron runs."""
+        if not _connect(): return False  # Nothing to flush to; ops stay queued for next time
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if self.push_pending(): return True
+            time.sleep(min(2.0, max(0.0, deadline - time.time())))
+        return False
+
+
+_replicator = Replicator()
+_pull_attempted = set()
+
+
+def kick():
+    _replicator.kick()
+
+
+def flush(timeout: float = 30.0) -> bool:
+    if not get_local_store().has_pending(): return True
+    return _replicator.flush(timeout)
+
+
+def ensure_fresh(tab: str):
+    """
+    Called by loaders before reading a local table.
+    First use in a process pulls the tab synchronously (once); afterwards a
+    stale tab is refreshed in the background.
+    """
+    store = get_local_store()
+    last = store.last_pulled(tab)
+    if not last and tab not in _pull_attempted:
+        _pull_attempted.add(tab)
+        if _connect():
+            _replicator.push_pending()
+            try: pull_tab(tab)
+            except Exception as e: print(f"⚠️ Sheets pull failed for {tab}: {e}")
+    elif last and time.time() - last > PULL_INTERVAL:
+        _replicator.request_pull(tab)
+
+
+def refresh_all():
+    """Queues a background pull of every tab (e.g. from a 'Sync' button)."""
+    for tab in TABS:
+        _replicator.request_pull(tab)
+
+
+atexit.register(flush)
@@ -0,0 +1,16 @@
+import pytest
+
+from src.models.job import Job
+
+
+def build_job(i, title=None, company="Unknown", description="", url=None, score=0):
+    return Job(
+        id=str(i), platform="test", title=title or f"Job {i}", company=company,
+        description=description, url=url or f"http://x/{i}", relevance_score=score,
+    )
+
+
+@pytest.fixture
+def make_job():
+    """Job factory: make_job(i, title=..., company=..., description=..., url=..., score=...)."""
+    return build_job
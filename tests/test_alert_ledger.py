@@ -0,0 +1,47 @@
+import threading
+import time
+
+from src.utils.history import AlertLedger
+
+
+def test_claim_only_returns_unalerted_jobs(tmp_path, make_job):
+    ledger = AlertLedger(db_path=str(tmp_path / "h.db"))
+    assert [j.id for j in ledger.claim([make_job(1), make_job(2)])] == ["1", "2"]
+    assert [j.id for j in ledger.claim([make_job(1), make_job(3)])] == ["3"]
+    # Same posting under another id (matched by URL), and duplicates within one call
+    assert ledger.claim([make_job(9, url="http://x/2"), make_job(4), make_job(4)]) == [make_job(4)]
+
+
+def test_release_makes_jobs_claimable_again(tmp_path, make_job):
+    ledger = AlertLedger(db_path=str(tmp_path / "h.db"))
+    jobs = ledger.claim([make_job(1), make_job(2)])
+    ledger.release(jobs[:1])
+    assert not ledger.was_alerted(make_job(1))
+    assert ledger.was_alerted(make_job(2))
+    assert [j.id for j in ledger.claim([make_job(1), make_job(2)])] == ["1"]
+
+
+def test_ledger_is_shared_and_expires(tmp_path, make_job):
+    path = str(tmp_path / "h.db")
+    AlertLedger(db_path=path).claim([make_job(1)])
+    assert AlertLedger(db_path=path).was_alerted(make_job(1))
+
+    expired = AlertLedger(db_path=path, ttl_days=1)
+    with expired.lock:
+        expired.conn.execute("UPDATE alerted SET alerted_at = ?", (time.time() - 2 * 86400,))
+    assert not expired.was_alerted(make_job(1))
+    assert expired.claim([make_job(1)]) == [make_job(1)]
+
+
+def test_concurrent_claims_never_overlap(tmp_path, make_job):
+    path = str(tmp_path / "h.db")
+    jobs = [make_job(i) for i in range(50)]
+    claimed = []
+
+    def run():
+        claimed.extend(j.id for j in AlertLedger(db_path=path).claim(jobs))
+
+    threads = [threading.Thread(target=run) for _ in range(4)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    assert sorted(claimed) == sorted(j.id for j in jobs)
@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+
+from src.graph import workflow
+from src.platforms import cursors
+
+
+@pytest.fixture(autouse=True)
+def cursor_file(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # History / alert DBs are opened relative to the cwd
+    monkeypatch.setattr(cursors, "CURSORS_FILE", str(tmp_path / "source_cursors.json"))
+    cursors._staged.clear()
+    yield
+    cursors._staged.clear()
+
+
+def pages_of(*pages):
+    async def fetch_page(page_no):
+        return pages[page_no] if page_no < len(pages) else []
+    return fetch_page
+
+
+def run_pages(pages, **kwargs):
+    return asyncio.run(cursors.fetch_new_pages("src", "q", pages_of(*pages), lambda item: item["ts"], max_pages=10, **kwargs))
+
+
+def test_newest_first_stops_at_seen_page():
+    cursors.stage_cursor("src", "q", 100)
+    cursors.commit_cursors()
+    items = run_pages([[{"ts": 300}, {"ts": 200}], [{"ts": 150}, {"ts": 50}], [{"ts": 400}]])
+    assert [i["ts"] for i in items] == [300, 200, 150]
+
+
+def test_unordered_pages_do_not_stop_early():
+    cursors.stage_cursor("src", "q", 100)
+    cursors.commit_cursors()
+    pages = [[{"ts": 50}, {"ts": 300}], [{"ts": 400}]]
+    assert [i["ts"] for i in run_pages(pages)] == [300, 400]
+    assert [i["ts"] for i in run_pages(pages, newest_first=False)] == [300, 400]
+
+
+def test_failed_middle_page_does_not_skip_postings():
+    cursors.stage_cursor("src", "q", 200)
+    cursors.commit_cursors()
+
+    # Run 2: page 1 fails (429), postings 300 and 250 were never seen
+    items = run_pages([[{"ts": 400}, {"ts": 350}], None, [{"ts": 250}, {"ts": 200}]])
+    assert [i["ts"] for i in items] == [400, 350]
+    cursors.commit_cursors()
+    assert cursors.get_cursor("src", "q") == 200
+
+    # Run 3: everything since the old cursor comes back
+    pages = [[{"ts": 500}, {"ts": 400}], [{"ts": 350}, {"ts": 300}], [{"ts": 250}, {"ts": 200}], [{"ts": 150}]]
+    assert [i["ts"] for i in run_pages(pages)] == [500, 400, 350, 300, 250, 200]
+    cursors.commit_cursors()
+    assert cursors.get_cursor("src", "q") == 500
+
+
+def test_raising_page_counts_as_failure():
+    cursors.stage_cursor("src", "q", 100)
+    cursors.commit_cursors()
+
+    async def fetch_page(page_no):
+        if page_no == 1: raise RuntimeError("timeout")
+        return [{"ts": 300}, {"ts": 200}]
+
+    items = asyncio.run(cursors.fetch_new_pages("src", "q", fetch_page, lambda item: item["ts"], max_pages=5))
+    assert [i["ts"] for i in items] == [300, 200]
+    cursors.commit_cursors()
+    assert cursors.get_cursor("src", "q") == 100
+
+
+def fake_run(monkeypatch, scorer):
+    monkeypatch.setattr(workflow, "fetch_source", lambda platform, state: (cursors.stage_cursor("remoteok", "q", 500) or []))
+    monkeypatch.setattr(workflow, "score_jobs", scorer)
+    monkeypatch.setattr(workflow, "log_results_node", lambda state: {})
+    monkeypatch.setattr(workflow, "notify_user", lambda state: {})
+    app = workflow.create_graph()
+    return app.invoke({"search_query": "q", "selected_platforms": ["RemoteOK"], "must_have_keywords": [],
+                       "raw_results": [], "normalized_jobs": [], "filtered_jobs": []})
+
+
+def test_cursors_commit_after_notifier(monkeypatch):
+    fake_run(monkeypatch, lambda state: {"filtered_jobs": []})
+    assert cursors.get_cursor("remoteok", "q") == 500
+
+
+def test_crash_before_notifier_keeps_old_cursor(monkeypatch):
+    def crash(state):
+        raise RuntimeError("LLM down")
+    with pytest.raises(RuntimeError):
+        fake_run(monkeypatch, crash)
+    assert cursors.get_cursor("remoteok", "q") is None
@@ -0,0 +1,62 @@
+import random
+
+from src.utils import dedupe
+from src.utils.dedupe import FingerprintIndex, _hash64, _to_signed, _to_unsigned, fingerprint, hamming, simhash
+
+
+def reference_simhash(features):
+    totals = [0.0] * 64
+    for feature, weight in features:
+        h = _hash64(feature)
+        for bit in range(64):
+            totals[bit] += weight if h >> bit & 1 else -weight
+    return sum(1 << bit for bit in range(64) if totals[bit] > 0)
+
+
+def test_simhash_matches_reference():
+    rng = random.Random(7)
+    for _ in range(300):
+        features = [(f"w{rng.randrange(10000)}", rng.choice([1.0, 2.0, 0.5])) for _ in range(rng.randrange(1, 40))]
+        fp = simhash(features)
+        assert 0 <= fp < 1 << 64
+        assert fp == reference_simhash(features)
+
+
+def test_fingerprint_survives_db_round_trip(tmp_path, make_job):
+    rng = random.Random(3)
+    jobs = [
+        make_job(str(i), f"Role {rng.randrange(10**6)}", f"Company {i}", " ".join(f"w{rng.randrange(10**6)}" for _ in range(80)))
+        for i in range(20)
+    ]
+    index = FingerprintIndex(db_path=str(tmp_path / "h.db"))
+    items = [(str(j.id), *fingerprint(j)) for j in jobs]
+    index.add_many(items)
+
+    reloaded = FingerprintIndex(db_path=str(tmp_path / "h.db"))
+    for job_id, head, body in items:
+        assert reloaded.entries[job_id] == (head, body)
+        assert _to_unsigned(_to_signed(head)) == head
+        assert reloaded.find("other", head, body) == job_id
+
+
+def test_hamming_on_fingerprints():
+    assert hamming(simhash([("a", 1.0)]), simhash([("a", 1.0)])) == 0
+    assert hamming(0, (1 << 64) - 1) == 64
+
+
+def test_placeholder_company_gigs_are_not_collapsed(tmp_path, monkeypatch, make_job):
+    monkeypatch.setattr(dedupe, "_index", FingerprintIndex(db_path=str(tmp_path / "h.db")))
+    gigs = [
+        make_job("1", "Web scraping with Python", "Freelancer Client", "Need a scraper for a shop"),
+        make_job("2", "Python web scraping", "Freelancer Client", "Scrape two news sites"),
+    ]
+    assert len(dedupe.collapse_near_duplicates(gigs)) == 2
+
+
+def test_cross_posts_are_collapsed(tmp_path, monkeypatch, make_job):
+    monkeypatch.setattr(dedupe, "_index", FingerprintIndex(db_path=str(tmp_path / "h.db")))
+    jobs = [
+        make_job("1", "Senior Python Developer", "Acme Inc"),
+        make_job("2", "Senior Python Developer", "Acme"),
+    ]
+    assert [j.id for j in dedupe.collapse_near_duplicates(jobs)] == ["1"]
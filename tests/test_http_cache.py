@@ -0,0 +1,43 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.platforms import http, http_cache
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    monkeypatch.setattr(http_cache, "CACHE_DIR", str(tmp_path / ".http_cache"))
+    http_cache._staged.clear()
+    seen_headers = []
+
+    async def fake_get(url, params=None, headers=None, timeout=None):
+        seen_headers.append(headers or {})
+        request = httpx.Request("GET", url)
+        if (headers or {}).get("If-None-Match") == '"v1"':
+            return httpx.Response(304, request=request)
+        return httpx.Response(200, text="feed v1", headers={"ETag": '"v1"'}, request=request)
+
+    monkeypatch.setattr(http, "get", fake_get)
+    yield seen_headers
+    http_cache._staged.clear()
+
+
+def poll():
+    return asyncio.run(http_cache.get_conditional("http://feed"))
+
+
+def test_etag_is_not_saved_before_the_checkpoint(server):
+    assert poll() == ("feed v1", True)
+    # Run crashed before commit_entries(): the next poll must get the body again
+    http_cache._staged.clear()
+    assert poll() == ("feed v1", True)
+    assert "If-None-Match" not in server[-1]
+
+
+def test_committed_etag_gives_304(server):
+    poll()
+    http_cache.commit_entries()
+    assert poll() == (None, False)
+    assert server[-1]["If-None-Match"] == '"v1"'
@@ -0,0 +1,37 @@
+from src.graph import workflow
+from src.llm import scoring
+from src.utils.kv_cache import KVCache
+from src.utils.ranking import rank_jobs, select_for_llm
+
+
+def test_low_similarity_jobs_still_reach_the_llm_by_default(make_job):
+    jobs = rank_jobs([make_job(1, "Django developer"), make_job(2, "Office manager")], "Python Django developer, AWS")
+    assert jobs[1].prerank_score < 0.05
+    shortlist, rest = select_for_llm(jobs, top_n=50)
+    assert len(shortlist) == 2 and not rest
+
+
+def test_budget_caps_shortlist(make_job):
+    jobs = rank_jobs([make_job(i, f"Python developer {i}") for i in range(5)], "Python developer")
+    shortlist, rest = select_for_llm(jobs, top_n=50, budget=0)
+    assert not shortlist and len(rest) == 5
+    assert not any(j.shortlisted for j in rest)
+    shortlist, rest = select_for_llm(jobs, top_n=50, budget=2)
+    assert len(shortlist) == 2 and all(j.shortlisted for j in shortlist)
+
+
+def test_skipped_jobs_reuse_cached_llm_scores(tmp_path, monkeypatch, make_job):
+    cache = KVCache("scores", 3600, 100, db_path=str(tmp_path / "cache.db"))
+    monkeypatch.setattr(scoring, "_score_cache", cache)
+    monkeypatch.setattr(workflow, "load_resume_text", lambda: "Python developer")
+    monkeypatch.setattr(workflow, "score_jobs_with_resume", lambda jobs, resume: jobs)
+
+    old = make_job(9, "Python developer 9")
+    profile_hash = scoring.content_hash("Python developer", scoring.PROMPT_VERSION, scoring.SCORING_MODEL)
+    cache.put(scoring.score_cache_key(old, profile_hash), {"score": 92, "reasoning": "Seen before"})
+
+    jobs = rank_jobs([make_job(i, f"Python developer {i}") for i in range(10)], "Python developer")
+    out = workflow.score_jobs({"normalized_jobs": jobs, "must_have_keywords": [], "llm_budget": 0})["filtered_jobs"]
+    by_id = {j.id: j for j in out}
+    assert by_id["9"].relevance_score == 92
+    assert by_id["1"].reasoning.startswith("Pre-ranked locally")
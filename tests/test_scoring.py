@@ -0,0 +1,30 @@
+import json
+
+from langchain_core.messages import AIMessage
+
+from src.llm import scoring
+from src.utils.kv_cache import KVCache
+
+
+def test_parse_score():
+    assert scoring.parse_score("85%") == 85
+    assert scoring.parse_score(" 72.6 ") == 73
+    assert scoring.parse_score(140) == 100
+    assert scoring.parse_score("high") is None
+    assert scoring.parse_score(None) is None
+
+
+def test_one_bad_score_does_not_fail_the_batch(tmp_path, monkeypatch, make_job):
+    answer = [
+        {"id": "1", "score": "85%", "reasoning": "Good"},
+        {"id": "2", "score": "very high", "reasoning": "?"},
+        {"id": "3", "score": 64, "reasoning": "Fine"},
+    ]
+    monkeypatch.setenv("GOOGLE_API_KEY", "test")
+    monkeypatch.setattr(scoring, "ChatGoogleGenerativeAI", lambda **kwargs: (lambda prompt: AIMessage(content=json.dumps(answer))))
+    cache = KVCache("scores", 3600, 100, db_path=str(tmp_path / "cache.db"))
+    monkeypatch.setattr(scoring, "_score_cache", cache)
+
+    jobs = scoring.score_jobs_with_resume([make_job(i) for i in (1, 2, 3)], "Python developer")
+    assert [j.relevance_score for j in jobs] == [85, 0, 64]
+    assert len(cache) == 2  # The good scores were still cached
@@ -0,0 +1,30 @@
+import re
+from html.parser import HTMLParser
+
+from src.notifications import telegram
+
+
+def assert_valid_entities(text):
+    # Every '&' must start a complete entity, otherwise Telegram rejects the message
+    for match in re.finditer("&", text):
+        assert re.match(r"&(amp|lt|gt|quot|#x27);", text[match.start():]), text[match.start():match.start() + 10]
+
+
+def test_digest_never_splits_entities(make_job):
+    jobs = [make_job(i, "R&D " * 40 + "<b>", "A&B " * 20, url=f"http://x/{i}?a=1&b=2", score=85) for i in range(5)]
+    for message in telegram.format_digest(jobs):
+        assert_valid_entities(message)
+        HTMLParser().feed(message)
+        assert len(message) <= telegram.MAX_MESSAGE_CHARS
+
+
+def test_digest_lists_overflow(make_job):
+    jobs = [make_job(i, f"Dev {i}", "Acme", score=85) for i in range(telegram.DIGEST_MAX_JOBS + 3)]
+    text = "".join(telegram.format_digest(jobs))
+    assert "and 3 more" in text
+
+
+def test_alert_escapes_fields():
+    text = telegram.format_alert("C++ <Lead>", "http://x/?a=1&b=2", 91, "Fits & more")
+    assert "&lt;Lead&gt;" in text and "Fits &amp; more" in text
+    assert_valid_entities(text)